@@ -22,9 +22,11 @@ import os
 import pika
 import shutil
 import tempfile
+import threading
 import time
 import zipfile
 import json
+from collections import OrderedDict
 from urllib.parse import quote
 
 from django.conf import settings
@@ -214,6 +216,56 @@ def has_references(obj):
     return False
 
 
+class OpenedArchives:
+    """
+    LRU cache of opened ZIP archives with parsed central directories. Archives are identified by their paths, sizes
+    and modification times, so changed archives are reopened. Archives are not shared between processes.
+    """
+    max_archives = 32
+    max_members = 100000
+
+    def __init__(self):
+        self._archives = OrderedDict()
+        self._members = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def read(self, file_path, name, not_exists_ok=False):
+        stat = os.stat(file_path)
+        key = (file_path, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if self._pid != os.getpid():
+                # Opened files can't be shared with the parent process
+                self.__clear()
+                self._pid = os.getpid()
+
+            if key in self._archives:
+                self._archives.move_to_end(key)
+                zfp = self._archives[key]
+            else:
+                zfp = zipfile.ZipFile(file_path, 'r')
+                self._archives[key] = zfp
+                self._members += len(zfp.infolist())
+                while len(self._archives) > 1 and \
+                        (len(self._archives) > self.max_archives or self._members > self.max_members):
+                    self.__close(self._archives.popitem(last=False)[1])
+
+            if not_exists_ok and name not in zfp.NameToInfo:
+                return None
+            return zfp.read(name)
+
+    def __close(self, zfp):
+        self._members -= len(zfp.infolist())
+        zfp.close()
+
+    def __clear(self):
+        while self._archives:
+            self.__close(self._archives.popitem()[1])
+
+
+OPENED_ARCHIVES = OpenedArchives()
+
+
 class ArchiveFileContent:
     def __init__(self, instance, field_name, file_name, not_exists_ok=False):
         self._instance = instance
@@ -226,12 +278,7 @@ class ArchiveFileContent:
         file_path = getattr(self._instance, self._field).path
         if os.path.splitext(file_path)[-1] != '.zip':
             raise ValueError('Archive type is not supported')
-        with open(file_path, mode='rb') as fp:
-            with zipfile.ZipFile(fp, 'r') as zfp:
-                if self._not_exists_ok:
-                    if self._name not in zfp.namelist():
-                        return None
-                return zfp.read(self._name)
+        return OPENED_ARCHIVES.read(file_path, self._name, not_exists_ok=self._not_exists_ok)
 
 
 class BridgeException(Exception):
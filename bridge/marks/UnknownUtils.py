@@ -19,13 +19,14 @@ import copy
 import json
 import re
 
+from django.db.models import Count, Max, Sum
 from django.utils.translation import ugettext_lazy as _
 
 from bridge.vars import ASSOCIATION_TYPE, PROBLEM_DESC_FILE
 from bridge.utils import BridgeException, logger, ArchiveFileContent, require_lock
 
 from reports.models import ReportUnknown
-from marks.models import MAX_PROBLEM_LEN, MarkUnknownHistory, MarkUnknownReport
+from marks.models import MAX_PROBLEM_LEN, MarkUnknown, MarkUnknownHistory, MarkUnknownReport
 
 from marks.utils import ConfirmAssociationBase, UnconfirmAssociationBase
 from caches.utils import RecalculateUnknownCache, UpdateUnknownCachesOnMarkChange
@@ -122,7 +123,11 @@ class MatchUnknown:
 
     def __match_desc_regexp(self):
         try:
-            m = re.search(self.function, self.description, re.MULTILINE)
+            if isinstance(self.function, str):
+                m = re.search(self.function, self.description, re.MULTILINE)
+            else:
+                # Precompiled regular expression
+                m = self.function.search(self.description)
         except Exception as e:
             logger.exception("Regexp error: %s" % e, stack_info=True)
             return None
@@ -139,6 +144,57 @@ class MatchUnknown:
         return self.pattern
 
 
+class UnknownMarksMatcher:
+    def __init__(self, component, stamp):
+        self.stamp = stamp
+        self._marks = []
+        for mark in MarkUnknown.objects.filter(component=component)\
+                .only('id', 'cache_attrs', 'function', 'problem_pattern', 'is_regexp'):
+            function = mark.function
+            if mark.is_regexp:
+                try:
+                    function = re.compile(mark.function, re.MULTILINE)
+                except Exception as e:
+                    logger.exception("Regexp error: %s" % e, stack_info=True)
+                    continue
+            self._marks.append((mark.id, mark.cache_attrs, function, mark.problem_pattern, mark.is_regexp))
+
+    def match(self, description, attrs):
+        """
+        Get problems of marks matching the unknown.
+        :param description: unknown problem description
+        :param attrs: unknown attributes
+        :return: dictionary {<mark id>: <problem>}
+        """
+        problems = {}
+        for mark_id, mark_attrs, function, pattern, is_regexp in self._marks:
+            if any(attrs.get(name) != value for name, value in mark_attrs.items()):
+                continue
+            problem = MatchUnknown(description, function, pattern, is_regexp).problem
+            if problem:
+                problems[mark_id] = problem
+        return problems
+
+
+# Matchers of unknown marks for each component
+_unknown_matchers = {}
+
+
+def get_unknown_matcher(component):
+    """
+    Get matcher of unknown marks for the component. Matchers are built once and rebuilt when component marks are
+    created, changed or deleted.
+    :param component: unknown component
+    :return: UnknownMarksMatcher instance
+    """
+    stamp = MarkUnknown.objects.filter(component=component)\
+        .aggregate(number=Count('id'), last=Max('id'), versions=Sum('version'))
+    matcher = _unknown_matchers.get(component)
+    if matcher is None or matcher.stamp != stamp:
+        matcher = _unknown_matchers[component] = UnknownMarksMatcher(component, stamp)
+    return matcher
+
+
 class ConnectUnknownMark:
     def __init__(self, mark, prime_id=None, author=None):
         self._mark = mark
@@ -416,27 +416,44 @@ class CompareReport:
         UnsafeConvertionCache.objects.bulk_create(new_cache)
         return reports_cache
 
-    def __get_marks_cache(self, marks_qs):
+    def __get_marks_cache(self, marks_qs, report_cache):
+        # Only marks which converted error traces have common forests with the report can be similar to it. Forests
+        # are indexed, so just converted error traces of such marks are got.
+        candidates_q = Q()
+        for convert_function, forests in report_cache.items():
+            if forests:
+                candidates_q |= Q(error_trace__function=convert_function,
+                                  error_trace__trace_cache__forest__has_any_keys=list(forests))
+            elif forests is not None:
+                # Empty converted error traces are equal
+                candidates_q |= Q(error_trace__function=convert_function, error_trace__trace_cache__forest=[])
+        candidates = {}
+        if candidates_q:
+            for mark_id, trace_cache in marks_qs.filter(candidates_q).values_list('id', 'error_trace__trace_cache'):
+                candidates[mark_id] = set(trace_cache['forest'])
+
         marks_cache = {}
-        # WARNING: ensure there is select_related('error_trace') for marks queryset
-        for mark in marks_qs:
-            marks_cache[mark.id] = {
-                'function': COMPARE_FUNCTIONS[mark.function]['convert'],
-                'threshold': mark.threshold,
-                'cache': set(mark.error_trace.trace_cache['forest'])
+        for mark_id, function, threshold in marks_qs.values_list('id', 'function', 'threshold'):
+            marks_cache[mark_id] = {
+                'function': COMPARE_FUNCTIONS[function]['convert'],
+                'threshold': threshold,
+                'cache': candidates.get(mark_id)
             }
         return marks_cache
 
     def compare(self, marks_qs):
         results = {}
         report_cache = self.__get_report_cache()
-        marks_cache = self.__get_marks_cache(marks_qs)
+        marks_cache = self.__get_marks_cache(marks_qs, report_cache)
         for mark_id in marks_cache:
             rep_cache_set = report_cache[marks_cache[mark_id]['function']]
             if rep_cache_set is None:
                 results[mark_id] = {
                     'result': 0, 'error': str(UNKNOWN_ERROR), 'associated': False
                 }
+            elif marks_cache[mark_id]['cache'] is None:
+                # The mark does not have common forests with the report
+                results[mark_id] = {'result': 0, 'error': None, 'associated': False}
             else:
                 res = jaccard(marks_cache[mark_id]['cache'], rep_cache_set)
                 results[mark_id] = {
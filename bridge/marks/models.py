@@ -40,6 +40,7 @@ class ConvertedTrace(WithFilesMixin, models.Model):
     hash_sum = models.CharField(max_length=255, db_index=True)
     file = models.FileField(upload_to=CONVERTED_DIR, null=False)
     function = models.CharField(max_length=30, db_index=True)
+    # Forests are indexed with GIN index created by migration
     trace_cache = JSONField()
 
     class Meta:
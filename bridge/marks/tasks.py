@@ -18,13 +18,13 @@
 from celery import shared_task
 
 from bridge.vars import PROBLEM_DESC_FILE
-from bridge.utils import BridgeException, ArchiveFileContent
+from bridge.utils import logger, BridgeException, ArchiveFileContent
 
 from reports.models import ReportSafe, ReportUnsafe, ReportUnknown
-from marks.models import MarkSafe, MarkSafeReport, MarkUnsafe, MarkUnsafeReport, MarkUnknown, MarkUnknownReport
+from marks.models import MarkSafe, MarkSafeReport, MarkUnsafe, MarkUnsafeReport, MarkUnknownReport
 
 from marks.UnsafeUtils import CompareReport
-from marks.UnknownUtils import MatchUnknown
+from marks.UnknownUtils import get_unknown_matcher
 from caches.utils import RecalculateSafeCache, RecalculateUnsafeCache, RecalculateUnknownCache
 
 
@@ -42,12 +42,12 @@ def connect_safe_report(report_id):
 @shared_task
 def connect_unsafe_report(report_id):
     report = ReportUnsafe.objects.select_related('cache').get(pk=report_id)
-    marks_qs = MarkUnsafe.objects.filter(cache_attrs__contained_by=report.cache.attrs).select_related('error_trace')
+    marks_qs = MarkUnsafe.objects.filter(cache_attrs__contained_by=report.cache.attrs)
     compare_results = CompareReport(report).compare(marks_qs)
 
     MarkUnsafeReport.objects.bulk_create(list(MarkUnsafeReport(
-        mark_id=mark.id, report=report, **compare_results[mark.id]
-    ) for mark in marks_qs))
+        mark_id=mark_id, report=report, **compare_results[mark_id]
+    ) for mark_id in compare_results))
     RecalculateUnsafeCache(report.id)
 
 
@@ -58,11 +58,33 @@ def connect_unknown_report(report_id):
         problem_desc = ArchiveFileContent(report, 'problem_description', PROBLEM_DESC_FILE).content.decode('utf8')
     except Exception as e:
         raise BridgeException("Can't read problem description for unknown '{}': {}".format(report.id, e))
-    new_markreports = []
-    for mark in MarkUnknown.objects.filter(component=report.component, cache_attrs__contained_by=report.cache.attrs):
-        problem = MatchUnknown(problem_desc, mark.function, mark.problem_pattern, mark.is_regexp).problem
-        if not problem:
-            continue
-        new_markreports.append(MarkUnknownReport(mark_id=mark.id, report=report, problem=problem, associated=True))
-    MarkUnknownReport.objects.bulk_create(new_markreports)
+    problems = get_unknown_matcher(report.component).match(problem_desc, report.cache.attrs)
+    MarkUnknownReport.objects.bulk_create(list(
+        MarkUnknownReport(mark_id=mark_id, report=report, problem=problem, associated=True)
+        for mark_id, problem in problems.items()
+    ))
     RecalculateUnknownCache(report.id)
+
+
+def connect_reports(connect_report, reports_ids):
+    # Each report is connected separately, so one bad report should not leave the other ones without marks.
+    for report_id in reports_ids:
+        try:
+            connect_report(report_id)
+        except Exception as e:
+            logger.exception(e)
+
+
+@shared_task
+def connect_safe_reports(reports_ids):
+    connect_reports(connect_safe_report, reports_ids)
+
+
+@shared_task
+def connect_unsafe_reports(reports_ids):
+    connect_reports(connect_unsafe_report, reports_ids)
+
+
+@shared_task
+def connect_unknown_reports(reports_ids):
+    connect_reports(connect_unknown_report, reports_ids)
@@ -44,7 +44,7 @@ from caches.models import ReportSafeCache, ReportUnsafeCache, ReportUnknownCache
 
 from reports.serializers import ReportAttrSerializer, ComputerSerializer
 from reports.tasks import fill_coverage_statistics
-from marks.tasks import connect_safe_report, connect_unsafe_report, connect_unknown_report
+from marks.tasks import connect_safe_reports, connect_unsafe_reports, connect_unknown_reports
 from service.utils import FinishDecision
 
 from reports.test import ReportsLogging
@@ -120,6 +120,10 @@ class UploadBaseSerializer(serializers.ModelSerializer):
     def __init__(self, *args, **kwargs):
         self.decision = kwargs.pop('decision')
         custom_fields = kwargs.pop('fields', None)
+        # Attributes of parents that can be shared between reports of the same batch
+        self._attrs_cache = kwargs.pop('attrs_cache', None)
+        # If specified, new attributes are collected there to be created in bulk later
+        self._new_attrs = kwargs.pop('new_attrs', None)
         super().__init__(*args, **kwargs)
         if custom_fields:
             for field_name in set(self.fields) - set(custom_fields):
@@ -159,9 +163,16 @@ class UploadBaseSerializer(serializers.ModelSerializer):
     def parent_attributes(self, parent, select_fields=None):
         if not select_fields:
             select_fields = ['name', 'value', 'compare', 'associate', 'data_id']
+        cache_key = (parent.id, tuple(select_fields))
+        if self._attrs_cache is not None and cache_key in self._attrs_cache:
+            return list(dict(adata) for adata in self._attrs_cache[cache_key])
+
         parents_ids = parent.get_ancestors(include_self=True).values_list('id', flat=True)
-        return list(ReportAttr.objects.filter(report_id__in=parents_ids)
-                    .order_by('report_id', 'id').values(*select_fields))
+        attrs_list = list(ReportAttr.objects.filter(report_id__in=parents_ids)
+                          .order_by('report_id', 'id').values(*select_fields))
+        if self._attrs_cache is not None:
+            self._attrs_cache[cache_key] = list(dict(adata) for adata in attrs_list)
+        return attrs_list
 
     def __validate_attrs(self, attrs, parent=None):
         if not attrs:
@@ -203,7 +214,11 @@ class UploadBaseSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         attrs = validated_data.pop('attrs', [])
         instance = super().create(validated_data)
-        ReportAttr.objects.bulk_create(list(ReportAttr(report=instance, **attrdata) for attrdata in attrs))
+        new_attrs = list(ReportAttr(report=instance, **attrdata) for attrdata in attrs)
+        if self._new_attrs is not None:
+            self._new_attrs.extend(new_attrs)
+        else:
+            ReportAttr.objects.bulk_create(new_attrs)
         return instance
 
     def update(self, instance, validated_data):
@@ -397,20 +412,40 @@ class ReportUnsafeSerializer(UploadLeafBaseSerializer):
 
 
 class UploadReport:
+    leaf_types = {'safe', 'unsafe', 'unknown'}
+
     def __init__(self, decision, archives=None):
         self.decision = decision
         self.archives = archives
 
         self._logger = ReportsLogging(self.decision.id)
 
+        # Consecutive leaf reports are saved in bulk. Attributes and ancestors of their parents are got just once.
+        self._attrs_cache = {}
+        self._ancestors_cache = {}
+        self._new_attrs = []
+        self._new_leaves = []
+        self._new_reports = {leaf_type: [] for leaf_type in self.leaf_types}
+
+        # Decision caches changes for each component
+        self._decision_cache = {}
+
     def upload_all(self, reports):
         # Check that all archives are valid ZIP files
         self.__check_archives()
-        for report in reports:
-            try:
+        try:
+            for report in reports:
                 self.__upload(report)
-            except Exception as e:
-                self.__process_exception(e)
+            self.__save_leaves()
+        except Exception as e:
+            # Save data of already uploaded reports
+            try:
+                self.__save_leaves()
+            except Exception as save_exc:
+                logger.exception(save_exc)
+            self.__process_exception(e)
+        finally:
+            self.__save_decision_caches()
 
     def __process_exception(self, exc):
         if isinstance(exc, CheckArchiveError):
@@ -471,9 +506,32 @@ class UploadReport:
                 'type': 'Report type "{}" is not supported'.format(data['type'])
             })
 
+        # Other reports can depend on leaves, their attributes or attributes of their parents
+        if data['type'] not in self.leaf_types:
+            self.__save_leaves()
+
         # Upload report
         supported_actions[data['type']](data)
 
+    def __save_leaves(self):
+        new_attrs, new_leaves, new_reports = self._new_attrs, self._new_leaves, self._new_reports
+        self._attrs_cache.clear()
+        self._ancestors_cache.clear()
+        self._new_attrs = []
+        self._new_leaves = []
+        self._new_reports = {leaf_type: [] for leaf_type in self.leaf_types}
+
+        ReportAttr.objects.bulk_create(new_attrs)
+        ReportComponentLeaf.objects.bulk_create(new_leaves)
+
+        # Connect reports with marks
+        if new_reports['safe']:
+            connect_safe_reports.delay(new_reports['safe'])
+        if new_reports['unsafe']:
+            connect_unsafe_reports.delay(new_reports['unsafe'])
+        if new_reports['unknown']:
+            connect_unknown_reports.delay(new_reports['unknown'])
+
     def __check_archives(self):
         if self.archives is None:
             self.archives = {}
@@ -503,11 +561,15 @@ class UploadReport:
             raise exceptions.ValidationError(detail={'identifier': "The report wasn't found"})
 
     def __ancestors_for_cache(self, report):
+        # Leaves have the same ancestors as their siblings
+        if report.parent_id in self._ancestors_cache:
+            return self._ancestors_cache[report.parent_id]
         ancestors_qs = report.get_ancestors()
         if self.decision.is_lightweight:
             # Update cache just for Core and verification reports as other reports will be deleted
             ancestors_qs = ancestors_qs.filter(Q(parent=None) | Q(reportcomponent__verification=True))
-        return list(parent.pk for parent in ancestors_qs)
+        self._ancestors_cache[report.parent_id] = list(parent.pk for parent in ancestors_qs)
+        return self._ancestors_cache[report.parent_id]
 
     def __create_report_component(self, data):
         self._logger.log("S0", data.get("identifier"))
@@ -688,7 +750,9 @@ class UploadReport:
 
         data['attr_data'] = self.__upload_attrs_files(self.__get_archive(data.get('attr_data')))
         data['problem_description'] = self.__get_archive(data['problem_description'])
-        serializer = ReportUnknownSerializer(data=data, decision=self.decision)
+        serializer = ReportUnknownSerializer(
+            data=data, decision=self.decision, attrs_cache=self._attrs_cache, new_attrs=self._new_attrs
+        )
         serializer.is_valid(raise_exception=True)
         report = serializer.save()
         self._logger.log("UN1", report.pk, report.parent_id)
@@ -703,12 +767,10 @@ class UploadReport:
             self._logger.log("UN2", report.pk, report.parent_id)
 
         # Caching leaves for each tree branch node
-        ReportComponentLeaf.objects.bulk_create(list(
+        self._new_leaves.extend(
             ReportComponentLeaf(report_id=parent_id, content_object=report) for parent_id in ancestors_ids
-        ))
-
-        # Connect report with marks
-        connect_unknown_report.delay(report.id)
+        )
+        self._new_reports['unknown'].append(report.id)
 
         self._logger.log("UN3", report.pk)
 
@@ -716,20 +778,20 @@ class UploadReport:
         self._logger.log("SF0", data.get('parent'))
 
         data['attr_data'] = self.__upload_attrs_files(self.__get_archive(data.get('attr_data')))
-        serializer = ReportSafeSerializer(data=data, decision=self.decision)
+        serializer = ReportSafeSerializer(
+            data=data, decision=self.decision, attrs_cache=self._attrs_cache, new_attrs=self._new_attrs
+        )
         serializer.is_valid(raise_exception=True)
         report = serializer.save()
 
         self._logger.log("SF1", report.pk, report.parent_id)
 
         # Caching leaves for each tree branch node
-        ReportComponentLeaf.objects.bulk_create(list(
+        self._new_leaves.extend(
             ReportComponentLeaf(report_id=parent_id, content_object=report)
             for parent_id in self.__ancestors_for_cache(report)
-        ))
-
-        # Connect report with marks
-        connect_safe_report.delay(report.id)
+        )
+        self._new_reports['safe'].append(report.id)
 
         self._logger.log("SF2", report.pk)
 
@@ -738,20 +800,20 @@ class UploadReport:
 
         data['attr_data'] = self.__upload_attrs_files(self.__get_archive(data.get('attr_data')))
         data['error_trace'] = self.__get_archive(data.get('error_trace'))
-        serializer = ReportUnsafeSerializer(data=data, decision=self.decision)
+        serializer = ReportUnsafeSerializer(
+            data=data, decision=self.decision, attrs_cache=self._attrs_cache, new_attrs=self._new_attrs
+        )
         serializer.is_valid(raise_exception=True)
         report = serializer.save()
 
         self._logger.log("UF1", report.pk, report.parent_id)
 
         # Caching leaves for each tree branch node
-        ReportComponentLeaf.objects.bulk_create(list(
+        self._new_leaves.extend(
             ReportComponentLeaf(report_id=parent_id, content_object=report)
             for parent_id in self.__ancestors_for_cache(report)
-        ))
-
-        # Connect new unsafe with marks
-        connect_unsafe_report.delay(report.id)
+        )
+        self._new_reports['unsafe'].append(report.id)
 
         self._logger.log("UF2", report.pk)
 
@@ -774,23 +836,38 @@ class UploadReport:
         # Fill coverage statistics in background
         fill_coverage_statistics.delay(carch.id)
 
-    @transaction.atomic
     def __update_decision_cache(self, component, **kwargs):
-        try:
-            cache_obj = DecisionCache.objects.select_for_update().get(decision=self.decision, component=component)
-        except DecisionCache.DoesNotExist:
-            cache_obj = DecisionCache(decision=self.decision, component=component)
+        # Changes are saved for all reports of the batch at once
+        cache_data = self._decision_cache.setdefault(component, {
+            'cpu_time': 0, 'wall_time': 0, 'memory': 0, 'total': 0, 'finished': 0
+        })
         if kwargs.get('cpu_time'):
-            cache_obj.cpu_time += kwargs['cpu_time']
+            cache_data['cpu_time'] += kwargs['cpu_time']
         if kwargs.get('wall_time'):
-            cache_obj.wall_time += kwargs['wall_time']
+            cache_data['wall_time'] += kwargs['wall_time']
         if kwargs.get('memory'):
-            cache_obj.memory = max(cache_obj.memory, kwargs['memory'])
+            cache_data['memory'] = max(cache_data['memory'], kwargs['memory'])
         if kwargs.get('started'):
-            cache_obj.total += 1
+            cache_data['total'] += 1
         if kwargs.get('finished'):
-            cache_obj.finished += 1
-        cache_obj.save()
+            cache_data['finished'] += 1
+
+    @transaction.atomic
+    def __save_decision_caches(self):
+        # Lock caches in the same order to avoid deadlocks between concurrent uploads
+        for component in sorted(self._decision_cache):
+            cache_data = self._decision_cache[component]
+            try:
+                cache_obj = DecisionCache.objects.select_for_update().get(decision=self.decision, component=component)
+            except DecisionCache.DoesNotExist:
+                cache_obj = DecisionCache(decision=self.decision, component=component)
+            cache_obj.cpu_time += cache_data['cpu_time']
+            cache_obj.wall_time += cache_data['wall_time']
+            cache_obj.memory = max(cache_obj.memory, cache_data['memory'])
+            cache_obj.total += cache_data['total']
+            cache_obj.finished += cache_data['finished']
+            cache_obj.save()
+        self._decision_cache = {}
 
     def __upload_attrs_files(self, archive):
         if not archive:
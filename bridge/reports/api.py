@@ -15,6 +15,7 @@
 # limitations under the License.
 #
 
+import gzip
 import json
 
 from django.http import HttpResponse
@@ -109,14 +110,19 @@ class UploadReportView(LoggedCallMixin, APIView):
         if decision.status != DECISION_STATUS[2][0]:
             raise exceptions.APIException('Reports can be uploaded only for processing decisions')
 
+        archives = request.FILES
         if 'report' in request.POST:
             data = [json.loads(request.POST['report'])]
         elif 'reports' in request.POST:
             data = json.loads(request.POST['reports'])
+        elif 'reports' in request.FILES:
+            # Compressed reports
+            data = json.loads(gzip.decompress(request.FILES['reports'].read()).decode('utf8'))
+            archives = dict((name, archive) for name, archive in request.FILES.items() if name != 'reports')
         else:
             raise exceptions.APIException('Report json data is required')
         try:
-            UploadReport(decision, request.FILES).upload_all(data)
+            UploadReport(decision, archives).upload_all(data)
         except CheckArchiveError as e:
             return Response({'ZIP error': str(e)}, status=HTTP_403_FORBIDDEN)
         return Response({})
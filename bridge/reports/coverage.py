@@ -261,25 +261,23 @@ class FillCoverageStatistics:
                 new_objects[curr_path].funcs_covered_extra += cov_funcs
                 new_objects[curr_path].funcs_total_extra += tot_func
 
-        ordered_objects_list = list(sorted(new_objects.values(), key=lambda x: (x.is_leaf, x.name)))
-
-        def __get_all_children(covstat_obj):
-            children = []
-            if covstat_obj.is_leaf:
-                return children
-            for obj in ordered_objects_list:
-                if obj.parent == covstat_obj.identifier:
-                    children.append(obj)
-                    children.extend(__get_all_children(obj))
-            return children
+        # Children of each directory in the order they are shown
+        children = {}
+        for obj in sorted(new_objects.values(), key=lambda x: (x.is_leaf, x.name)):
+            children.setdefault(obj.parent, []).append(obj)
 
         ordered_objects = []
         for root_name in ROOT_DIRS_ORDER:
             root_path = (root_name,)
             if root_path not in new_objects:
                 continue
-            ordered_objects.append(new_objects[root_path])
-            ordered_objects.extend(__get_all_children(new_objects[root_path]))
+            # Depth-first traversal visiting each object once
+            objects_stack = [new_objects[root_path]]
+            while objects_stack:
+                obj = objects_stack.pop()
+                ordered_objects.append(obj)
+                if not obj.is_leaf:
+                    objects_stack.extend(reversed(children.get(obj.identifier, [])))
 
         CoverageStatistics.objects.bulk_create(ordered_objects)
 
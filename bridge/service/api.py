@@ -15,6 +15,10 @@
 # limitations under the License.
 #
 
+import datetime
+
+from django.utils.timezone import now
+
 from rest_framework import exceptions
 from rest_framework.generics import (
     get_object_or_404, RetrieveAPIView, CreateAPIView, RetrieveDestroyAPIView, RetrieveUpdateAPIView
@@ -27,6 +31,7 @@ from rest_framework.viewsets import ModelViewSet
 from bridge.vars import TASK_STATUS, DECISION_STATUS
 from bridge.access import ServicePermission
 from bridge.CustomViews import StreamingResponseAPIView
+from bridge.serializers import TimeStampField
 from tools.profiling import LoggedCallMixin
 
 from users.models import SchedulerUser
@@ -75,6 +80,44 @@ class TaskAPIViewset(LoggedCallMixin, ModelViewSet):
         instance.delete()
 
 
+class RemoveTasksAPIView(LoggedCallMixin, APIView):
+    permission_classes = (ServicePermission,)
+    unparallel = [Decision]
+
+    def post(self, request, identifier):
+        decision = get_object_or_404(Decision.objects.only('id'), identifier=identifier)
+        if not isinstance(request.data.get('tasks'), list):
+            raise exceptions.ValidationError({'tasks': 'The list of tasks identifiers is required'})
+
+        # Check tasks like for removing them one by one. Nothing is removed if there is some wrong task.
+        tasks = Task.objects.filter(decision=decision, id__in=request.data['tasks'])
+        if tasks.exclude(status__in={TASK_STATUS[2][0], TASK_STATUS[3][0], TASK_STATUS[4][0]}).exists():
+            raise exceptions.ValidationError({'status': 'Some tasks are not finished'})
+        if tasks.filter(status=TASK_STATUS[2][0], solution__isnull=True).exists():
+            raise exceptions.ValidationError({'solution': 'Some task solutions were not uploaded'})
+        tasks.delete()
+        return Response({})
+
+
+class TasksStatusesChangesAPIView(LoggedCallMixin, APIView):
+    permission_classes = (ServicePermission,)
+
+    # Task changes can be committed a bit later than their time is set, so the returned cursor is moved back a little.
+    # Core ignores statuses that it already knows.
+    cursor_overlap = datetime.timedelta(seconds=10)
+
+    def get(self, request, identifier):
+        decision = get_object_or_404(Decision.objects.only('id'), identifier=identifier)
+        cursor = now() - self.cursor_overlap
+        queryset = Task.objects.filter(decision=decision)
+        if 'since' in request.query_params:
+            queryset = queryset.filter(changed__gte=TimeStampField().to_internal_value(request.query_params['since']))
+        return Response({
+            'cursor': cursor.timestamp(),
+            'tasks': list({'id': t_id, 'status': status} for t_id, status in queryset.values_list('id', 'status'))
+        })
+
+
 class DownloadTaskArchiveView(StreamingResponseAPIView):
     permission_classes = (ServicePermission,)
 
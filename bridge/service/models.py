@@ -77,6 +77,7 @@ class Task(WithFilesMixin, models.Model):
     filename = models.CharField(max_length=256)
     archive = models.FileField(upload_to=SERVICE_DIR)
     description = JSONField()
+    changed = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = 'task'
@@ -217,7 +217,7 @@ class TaskSerializer(DynamicFieldsModelSerializer):
 
     class Meta:
         model = Task
-        exclude = ('decision', 'filename')
+        exclude = ('decision', 'filename', 'changed')
         extra_kwargs = {'archive': {'write_only': True}}
 
 
@@ -419,7 +419,7 @@ class SchedulerSerializer(serializers.ModelSerializer):
             # Pending or processing tasks
             tasks_updated = Task.objects.filter(
                 status__in=[TASK_STATUS[0][0], TASK_STATUS[1][0]], decision=decision
-            ).update(error=self.task_error)
+            ).update(error=self.task_error, changed=now())
             decision.tasks_error += tasks_updated
             if scheduler.type == SCHEDULER_TYPE[0][0]:
                 if not decision.finish_date:
@@ -0,0 +1,182 @@
+#
+# Copyright (c) 2020 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import collections
+import signal
+import threading
+from multiprocessing.managers import BaseManager, BaseProxy
+
+from clade import Clade
+
+
+# Read-only queries that are answered by the Clade query service. Results of memoized ones are kept within the service
+# process since they are requested many times with the same arguments by different verification tasks.
+QUERIES = (
+    'work_dir_ok',
+    'get_meta',
+    'get_uuid',
+    'get_storage_path',
+    'get_file_size',
+    'get_cmd',
+    'get_cmd_type',
+    'get_cmd_opts',
+    'get_cmd_deps',
+    'get_all_cmds_by_type',
+    'get_root_cmds_by_type',
+    'get_compilation_cmds_by_file',
+    'get_callgraph',
+    'get_functions_by_file',
+    'get_typedefs',
+    'get_variables',
+    'get_used_in_vars_functions',
+    'get_macros_expansions',
+    'get_macros_definitions',
+    'get_ref_to',
+    'get_ref_from'
+)
+MEMOIZED_QUERIES = (
+    'get_meta',
+    'get_uuid',
+    'get_callgraph',
+    'get_functions_by_file',
+    'get_typedefs',
+    'get_variables',
+    'get_used_in_vars_functions',
+    'get_macros_expansions',
+    'get_macros_definitions'
+)
+MEMOIZED_RESULTS_NUM = 32
+
+
+def _freeze(value):
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    elif isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+
+    return value
+
+
+class SharedClade(Clade):
+    """Clade interface living within the Clade query service process."""
+
+    def __init__(self, *args, **kwargs):
+        super(SharedClade, self).__init__(*args, **kwargs)
+        self.__results = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __getattribute__(self, name):
+        attr = super(SharedClade, self).__getattribute__(name)
+        if name in MEMOIZED_QUERIES:
+            def memoized_query(*args, **kwargs):
+                key = (name, _freeze(args), _freeze(kwargs))
+                with self.__lock:
+                    if key in self.__results:
+                        self.__results.move_to_end(key)
+                        return self.__results[key]
+
+                result = attr(*args, **kwargs)
+
+                with self.__lock:
+                    self.__results[key] = result
+                    if len(self.__results) > MEMOIZED_RESULTS_NUM:
+                        self.__results.popitem(last=False)
+
+                return result
+
+            return memoized_query
+
+        return attr
+
+    # Generators can not be sent to clients.
+    def get_compilation_cmds_by_file(self, file):
+        return list(super(SharedClade, self).get_compilation_cmds_by_file(file))
+
+
+class CladeProxy(BaseProxy):
+    _exposed_ = ('__getattribute__',) + QUERIES
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        if name in QUERIES:
+            return lambda *args, **kwargs: self._callmethod(name, args, kwargs)
+
+        # Get values of properties like "storage_dir".
+        return self._callmethod('__getattribute__', (name,))
+
+
+class CladeManager(BaseManager):
+    pass
+
+
+_clade = None
+
+
+def _get_clade():
+    return _clade
+
+
+def _init_service(build_base):
+    global _clade
+
+    # Parent components send SIGUSR1 to all their children when something went wrong, so just terminate.
+    signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+    _clade = SharedClade(build_base)
+
+
+CladeManager.register('Clade', callable=_get_clade, proxytype=CladeProxy)
+
+
+def start_service(logger, conf):
+    """
+    Start the Clade query service that loads the build base once and answers queries of all job components.
+
+    :param logger: Logger object.
+    :param conf: Configuration dictionary. Address of the service is stored there.
+    :return: CladeManager object that should be shut down when the service is not needed any more.
+    """
+    logger.info('Start Clade query service for build base "{0}"'.format(conf['build base']))
+    manager = CladeManager()
+    manager.start(_init_service, (conf['build base'],))
+    conf['Clade query service address'] = manager.address
+    logger.debug('Clade query service listens to "{0}"'.format(manager.address))
+
+    return manager
+
+
+def get_clade(logger, conf):
+    """
+    Get Clade interface for the build base. If the Clade query service is started, requests will be passed to it.
+    Otherwise, a new Clade object will be created.
+
+    :param logger: Logger object.
+    :param conf: Configuration dictionary.
+    :return: Either CladeProxy or Clade object.
+    """
+    if conf.get('Clade query service address'):
+        manager = CladeManager(address=conf['Clade query service address'])
+        try:
+            manager.connect()
+            return manager.Clade()
+        except (OSError, EOFError) as err:
+            logger.warning('Could not connect to Clade query service: {0}'.format(err))
+
+    return Clade(conf['build base'])
@@ -108,10 +108,29 @@ def all_child_resources():
     return total_child_resources
 
 
-def count_consumed_resources(logger, start_time, include_child_resources=False, child_resources=None):
+def get_cpu_time(include_child_resources=False):
+    """
+    Get CPU time consumed by the process and optionally by its finished children.
+
+    :param include_child_resources: Flag.
+    :return: CPU time in seconds.
+    """
+    utime, stime = resource.getrusage(resource.RUSAGE_SELF)[0:2]
+    if include_child_resources:
+        utime_children, stime_children = resource.getrusage(resource.RUSAGE_CHILDREN)[0:2]
+        utime += utime_children
+        stime += stime_children
+
+    return utime + stime
+
+
+def count_consumed_resources(logger, start_time, include_child_resources=False, child_resources=None,
+                             excluded_cpu_time=0.0):
     """
     Count resources (wall time, CPU time and maximum memory size) consumed by the process without its children.
     Note that launching under PyCharm gives its maximum memory size rather than the process one.
+    :param excluded_cpu_time: CPU time in seconds that should not be taken into account, e.g. the one consumed before
+                              the component started in the same process or by components run in the same process.
     :return: resources.
     """
     logger.debug('Count consumed resources')
@@ -136,7 +155,7 @@ def count_consumed_resources(logger, start_time, include_child_resources=False,
 
     resources = {
         'wall_time': round(1000 * (time.time() - start_time)),
-        'cpu_time': round(1000 * (utime + stime)),
+        'cpu_time': round(1000 * (utime + stime - excluded_cpu_time)),
         'memory': 1000 * maxrss
     }
 
@@ -337,6 +356,12 @@ class Component(multiprocessing.Process, CallbacksCaller):
         # Component start time.
         self.tasks_start_time = 0
         self.__pid = None
+        # Components can be run within the process of their parents. CPU time consumed before their start and CPU time
+        # consumed by such the components themselves are not counted.
+        self.in_process = False
+        self.excluded_cpu_time = 0.0
+        # Component run within the current process and the working directory to be restored after it finishes.
+        self.__in_process_component = None
 
         self.clean_dir = False
         self.excluded_clean = []
@@ -365,8 +390,9 @@ class Component(multiprocessing.Process, CallbacksCaller):
 
         # Specially process SIGUSR1 since it can be sent by parent when some other component(s) failed. Counting
         # consumed resources and creating reports will be performed in self.__finalize() both when components terminate
-        # normally and are stopped.
-        signal.signal(signal.SIGUSR1, self.__stop)
+        # normally and are stopped. Components run within the process of their parents rely on parent handlers.
+        if not self.in_process:
+            signal.signal(signal.SIGUSR1, self.__stop)
 
         if self.separate_from_parent:
             self.logger.info('Change working directory to "{0}" for component "{1}"'.format(self.work_dir, self.name))
@@ -428,7 +454,7 @@ class Component(multiprocessing.Process, CallbacksCaller):
                 child_resources = all_child_resources()
                 report = {'identifier': self.id}
                 report.update(count_consumed_resources(self.logger, self.tasks_start_time, self.include_child_resources,
-                                                       child_resources))
+                                                       child_resources, self.excluded_cpu_time))
                 # todo: this is embarassing
                 if self.coverage:
                     report['coverage'] = self.coverage
@@ -457,7 +483,10 @@ class Component(multiprocessing.Process, CallbacksCaller):
                         os.remove(to_del)
                     elif os.path.isdir(to_del):
                         shutil.rmtree(to_del)
-            if stopped or exception:
+            if self.in_process:
+                if exception:
+                    raise ComponentError('Component "{0}" failed'.format(self.name))
+            elif stopped or exception:
                 # Treat component stopping as normal termination.
                 exit_code = os.EX_SOFTWARE if exception else os.EX_OK
                 self.logger.info('Exit with code "{0}"'.format(exit_code))
@@ -491,6 +520,19 @@ class Component(multiprocessing.Process, CallbacksCaller):
             except ComponentError:
                 pass
 
+        # Component run within the current process should be finalized at first since otherwise it will not create
+        # its finish report while this component will be finalized within the working directory of that component.
+        if self.__in_process_component:
+            component, cwd = self.__in_process_component
+            self.logger.info('{0}Stop component "{1}" run within the current process'
+                             .format(self.__get_subcomponent_name(), component.name))
+            try:
+                component.__finalize(stopped=True)
+            except ComponentError:
+                pass
+            finally:
+                os.chdir(cwd)
+
         self.logger.error('{0}Stop since some other component(s) likely failed'.format(self.__get_subcomponent_name()))
 
         self.__finalize(stopped=True)
@@ -508,6 +550,42 @@ class Component(multiprocessing.Process, CallbacksCaller):
             self.logger.warning('Component "{0}" exitted with "{1}"'.format(self.name, self.exitcode))
             raise ComponentError('Component "{0}" failed'.format(self.name))
 
+    def launch_in_process(self, component):
+        """
+        Run given component within the current process rather than within a separate one. This saves time for forking
+        and serializing data while the component still has its working directory, logs, reports and consumed resources.
+
+        :param component: Component object.
+        :return: None.
+        :raise ComponentError: The component failed.
+        """
+        self.logger.info('Run component "{0}" within the current process'.format(component.name))
+
+        if component.separate_from_parent and not os.path.isdir(component.work_dir):
+            self.logger.info(
+                'Create working directory "{0}" for component "{1}"'.format(component.work_dir, component.name))
+            os.makedirs(component.work_dir.encode('utf8'))
+
+        cwd = os.getcwd()
+        start_cpu_time = get_cpu_time()
+        component.in_process = True
+        component.excluded_cpu_time = get_cpu_time(component.include_child_resources)
+        self.__in_process_component = (component, cwd)
+        try:
+            component.run()
+        # Components exit if executed commands fail.
+        except SystemExit:
+            raise ComponentError('Component "{0}" failed'.format(component.name)) from None
+        finally:
+            self.__in_process_component = None
+            os.chdir(cwd)
+            # Component has its own logger that should not write anything more.
+            for handler in list(component.logger.handlers):
+                component.logger.removeHandler(handler)
+                handler.close()
+            # Component reported its resources itself.
+            self.excluded_cpu_time += get_cpu_time() - start_cpu_time
+
     def function_to_subcomponent(self, include_child_resources, name, executable):
         """
         Convert given function or component into Component to run it as a subcomponent.
@@ -16,6 +16,7 @@
 #
 
 import argparse
+import concurrent.futures
 import json
 import hashlib
 import multiprocessing
@@ -279,66 +280,143 @@ class Core(klever.core.components.CallbacksCaller):
 
 
 class Reporter(klever.core.components.Component):
+    # Batches of reports are enlarged or reduced so that uploading of each of them takes about this time in seconds.
+    UPLOAD_TIME = 3
+    # Batch volume limits in bytes. Each batch contains at least one report regardless of its volume.
+    INITIAL_BATCH_VOLUME = 1024 * 1024
+    MIN_BATCH_VOLUME = 64 * 1024
+    MAX_BATCH_VOLUME = 64 * 1024 * 1024
 
     def __init__(self, conf, logger, parent_id, callbacks, mqs, vals, id=None, work_dir=None, attrs=None,
                  separate_from_parent=False, include_child_resources=False, session=None):
         super(Reporter, self).__init__(conf, logger, parent_id, callbacks, mqs, vals, id, work_dir, attrs,
                                        separate_from_parent, include_child_resources)
         self.session = session
+        self.batch_volume = self.INITIAL_BATCH_VOLUME
+        # Parents of component and verification reports that are necessary to keep order of dependent reports.
+        self.parents = {}
+        # Sessions with persistent connections to Bridge that are not used by uploading threads at the moment.
+        self.sessions = queue.Queue()
 
     def send_reports(self):
-        issleep = True
-        while True:
-            # Report batches of reports each 3 seconds. This reduces the number of requests quite considerably.
-            if issleep:
-                time.sleep(3)
-            else:
-                issleep = True
-
-            reports_and_report_file_archives = []
-            is_finish = False
-            while True:
-                try:
-                    # TODO: replace MQ with "reports and report file archives".
-                    report_and_report_file_archives = self.mqs['report files'].get_nowait()
+        workers_num = self.conf.get('report uploading workers', 4)
+        if self.session:
+            self.sessions.put(self.session)
+
+        # Identifiers and parents of reports that are being uploaded by futures.
+        uploads = {}
+        is_finish = False
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers_num) as executor:
+            while not is_finish:
+                batch = []
+                batch_volume = 0
+                while batch_volume < self.batch_volume:
+                    try:
+                        # TODO: replace MQ with "reports and report file archives".
+                        if batch:
+                            # Upload available reports without waiting for new ones.
+                            report_and_report_file_archives = self.mqs['report files'].get_nowait()
+                        elif uploads:
+                            report_and_report_file_archives = self.mqs['report files'].get(timeout=1)
+                        else:
+                            report_and_report_file_archives = self.mqs['report files'].get()
+                    except queue.Empty:
+                        if batch:
+                            break
+                        self.__wait_uploads(uploads, 0)
+                        continue
 
                     if report_and_report_file_archives is None:
                         self.logger.debug('Report files message queue was terminated')
                         is_finish = True
                         break
 
-                    reports_and_report_file_archives.append(report_and_report_file_archives)
+                    batch_volume += self.__load_report(report_and_report_file_archives)
+                    batch.append(report_and_report_file_archives)
 
-                    # Do not send more than 10 reports at once. Otherwise different strange issues may appear im Core
-                    # and Bridge.
-                    if len(reports_and_report_file_archives) == 10:
-                        # Do not sleep since there may be pending reports already.
-                        issleep = False
-                        break
-                except queue.Empty:
-                    break
-
-            if reports_and_report_file_archives:
-                for report_and_report_file_archives in reports_and_report_file_archives:
-                    report_file_archives = report_and_report_file_archives.get('report file archives')
-                    self.logger.debug('Upload report file "{0}"{1}'.format(
-                        report_and_report_file_archives['report file'],
-                        ' with report file archives:\n{0}'
-                        .format('\n'.join(['  {0}'.format(archive) for archive in report_file_archives]))
-                        if report_file_archives else ''))
-
-                self.session.upload_reports_and_report_file_archives(reports_and_report_file_archives)
-
-                # Remove reports and report file archives if needed.
-                if not self.conf['keep intermediate files']:
-                    for report_and_report_file_archives in reports_and_report_file_archives:
-                        os.remove(report_and_report_file_archives['report file'])
-                        report_file_archives = report_and_report_file_archives.get('report file archives')
-                        if report_file_archives:
-                            for archive in report_file_archives:
-                                os.remove(archive)
-
-            if is_finish:
-                break
+                if not batch:
+                    continue
+
+                identifiers, parents = self.__get_scope(batch)
+
+                # Reports can be uploaded concurrently just when they do not refer reports that are being uploaded and
+                # when they are not finish reports of parents of reports that are being uploaded.
+                while len(uploads) >= workers_num or any((identifiers | parents) & upload_identifiers
+                                                         or identifiers & upload_parents
+                                                         for upload_identifiers, upload_parents in uploads.values()):
+                    self.__wait_uploads(uploads, None)
+
+                uploads[executor.submit(self.__upload, batch, batch_volume >= self.batch_volume)] = \
+                    (identifiers, parents)
+
+            while uploads:
+                self.__wait_uploads(uploads, None)
 
     main = send_reports
+
+    def __load_report(self, report_and_report_file_archives):
+        with open(report_and_report_file_archives['report file'], encoding='utf8') as fp:
+            report_and_report_file_archives['report'] = json.load(fp)
+
+        return os.path.getsize(report_and_report_file_archives['report file']) + \
+            sum(os.path.getsize(archive) for archive in report_and_report_file_archives.get('report file archives', []))
+
+    def __get_scope(self, batch):
+        identifiers = set()
+        parents = set()
+        for report_and_report_file_archives in batch:
+            report = report_and_report_file_archives['report']
+            if report.get('parent'):
+                parents.add(report['parent'])
+            if report.get('identifier'):
+                identifiers.add(report['identifier'])
+                if report['type'] in ('start', 'verification'):
+                    self.parents[report['identifier']] = report.get('parent')
+                elif self.parents.get(report['identifier']):
+                    parents.add(self.parents[report['identifier']])
+
+        return identifiers, parents
+
+    def __wait_uploads(self, uploads, timeout):
+        done, _ = concurrent.futures.wait(uploads, timeout, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            del uploads[future]
+            upload_time, is_full_batch = future.result()
+
+            # Adapt volume of batches to Bridge response time.
+            if upload_time > self.UPLOAD_TIME:
+                self.batch_volume = max(self.batch_volume // 2, self.MIN_BATCH_VOLUME)
+            elif is_full_batch and upload_time < self.UPLOAD_TIME / 2:
+                self.batch_volume = min(self.batch_volume * 2, self.MAX_BATCH_VOLUME)
+
+    def __upload(self, batch, is_full_batch):
+        for report_and_report_file_archives in batch:
+            report_file_archives = report_and_report_file_archives.get('report file archives')
+            self.logger.debug('Upload report file "{0}"{1}'.format(
+                report_and_report_file_archives['report file'],
+                ' with report file archives:\n{0}'
+                .format('\n'.join(['  {0}'.format(archive) for archive in report_file_archives]))
+                if report_file_archives else ''))
+
+        try:
+            session = self.sessions.get_nowait()
+        except queue.Empty:
+            session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'])
+
+        start_time = time.time()
+        try:
+            session.upload_reports_and_report_file_archives(batch)
+        finally:
+            self.sessions.put(session)
+        upload_time = time.time() - start_time
+
+        # Remove reports and report file archives if needed.
+        if not self.conf['keep intermediate files']:
+            for report_and_report_file_archives in batch:
+                os.remove(report_and_report_file_archives['report file'])
+                report_file_archives = report_and_report_file_archives.get('report file archives')
+                if report_file_archives:
+                    for archive in report_file_archives:
+                        os.remove(archive)
+
+        return upload_time, is_full_batch
@@ -15,6 +15,7 @@
 # limitations under the License.
 #
 
+import array
 import json
 import os
 import shutil
@@ -29,21 +30,20 @@ coverage_format_version = 1
 
 def add_to_coverage(merged_coverage_info, coverage_info):
     for file_name, file_coverage_info in coverage_info.items():
-        merged_coverage_info.setdefault(file_name, {
+        merged_file_coverage_info = merged_coverage_info.setdefault(file_name, {
             'total functions': coverage_info[file_name]['total functions'],
             'covered lines': dict(),
             'covered functions': dict(),
-            'covered function names': list()
+            # Merged covered function names are kept in sets.
+            'covered function names': set()
         })
 
         for kind in ('covered lines', 'covered functions'):
+            merged_kind_coverage_info = merged_file_coverage_info[kind]
             for line, cov_num in file_coverage_info[kind].items():
-                merged_coverage_info[file_name][kind].setdefault(line, 0)
-                merged_coverage_info[file_name][kind][line] += cov_num
+                merged_kind_coverage_info[line] = merged_kind_coverage_info.get(line, 0) + cov_num
 
-        for cov_func_name in file_coverage_info['covered function names']:
-            if cov_func_name not in merged_coverage_info[file_name]['covered function names']:
-                merged_coverage_info[file_name]['covered function names'].append(cov_func_name)
+        merged_file_coverage_info['covered function names'].update(file_coverage_info['covered function names'])
 
 
 def convert_coverage(merged_coverage_info, coverage_dir, pretty, src_files_info=None):
@@ -118,6 +118,8 @@ def convert_coverage(merged_coverage_info, coverage_dir, pretty, src_files_info=
 class JCR(klever.core.components.Component):
 
     COVERAGE_FILE_NAME = "cached coverage.json"
+    # Total coverage is dumped for debugging purposes after merging each such number of coverages.
+    COVERAGE_CHECKPOINT = 100
 
     def __init__(self, conf, logger, parent_id, callbacks, mqs, vals, id=None, work_dir=None, attrs=None,
                  separate_from_parent=True, include_child_resources=False, queues_to_terminate=None):
@@ -174,11 +176,9 @@ class JCR(klever.core.components.Component):
                         counters.setdefault(sub_job_id, dict())
                         counters[sub_job_id].setdefault(req_spec_id, 0)
                         counters[sub_job_id][req_spec_id] += 1
-                        if counters[sub_job_id][req_spec_id] >= 10:
-                            self.__read_data(total_coverage_infos, sub_job_id, req_spec_id)
+                        if self.conf['keep intermediate files'] and \
+                                counters[sub_job_id][req_spec_id] % self.COVERAGE_CHECKPOINT == 0:
                             self.__save_data(total_coverage_infos, sub_job_id, req_spec_id)
-                            self.__clean_data(total_coverage_infos, sub_job_id, req_spec_id)
-                            counters[sub_job_id][req_spec_id] = 0
                     else:
                         self.logger.warning("There is no coverage file {!r}".
                                             format(coverage_info['coverage info file']))
@@ -191,8 +191,7 @@ class JCR(klever.core.components.Component):
                     # This is ugly. But this should disappear after implementing TODO at klever.core.job.start_jobs.
                     sub_job_dir = 'job' if sub_job_id == '-' else 'sub-job {0}'.format(sub_job_id)
 
-                    for req_spec_id in counters[sub_job_id]:
-                        self.__read_data(total_coverage_infos, sub_job_id, req_spec_id)
+                    for req_spec_id in counters.pop(sub_job_id, {}):
                         coverage_info = total_coverage_infos[sub_job_id][req_spec_id]
                         total_coverage_dir = os.path.join(self.__get_total_cov_dir(sub_job_id, req_spec_id), 'report')
 
@@ -204,7 +203,8 @@ class JCR(klever.core.components.Component):
                         total_coverage_dirs.append(total_coverage_dir)
 
                         total_coverages[req_spec_id] = klever.core.utils.ArchiveFiles([total_coverage_dir])
-                        self.__save_data(total_coverage_infos, sub_job_id, req_spec_id)
+                        if self.conf['keep intermediate files']:
+                            self.__save_data(total_coverage_infos, sub_job_id, req_spec_id)
                         self.__clean_data(total_coverage_infos, sub_job_id, req_spec_id)
 
                     # This isn't great to build component identifier in such the artificial way.
@@ -267,42 +267,13 @@ class JCR(klever.core.components.Component):
 
         return total_coverage_dir
 
-    def __read_data(self, cache, sub_job_id, requirement):
-        file_name = os.path.join(self.__get_total_cov_dir(sub_job_id, requirement), self.COVERAGE_FILE_NAME)
-
-        if os.path.isfile(file_name):
-            with open(file_name, 'r', encoding='utf8') as fp:
-                large_cache = json.load(fp)
-        else:
-            large_cache = dict()
-
-        cache.setdefault(sub_job_id, dict())
-        cache[sub_job_id].setdefault(requirement, dict())
-
-        for file_name in large_cache:
-            # todo: Thic code is close to function add_to_coverage
-            cache[sub_job_id][requirement].setdefault(file_name, {
-                'total functions': large_cache[file_name]['total functions'],
-                'covered lines': {},
-                'covered functions': {},
-                'covered function names': list()
-            })
-
-            for path in ('covered lines', 'covered functions'):
-                for line, value in large_cache[file_name][path].items():
-                    cache[sub_job_id][requirement][file_name][path].setdefault(line, 0)
-                    cache[sub_job_id][requirement][file_name][path][line] += value
-            if large_cache[file_name].get('covered function names'):
-                for name in large_cache[file_name]['covered function names']:
-                    if name not in cache[sub_job_id][requirement][file_name]['covered function names']:
-                        cache[sub_job_id][requirement][file_name]['covered function names'].append(name)
-
     def __save_data(self, cache, sub_job_id, requirement):
         file_name = os.path.join(self.__get_total_cov_dir(sub_job_id, requirement), self.COVERAGE_FILE_NAME)
         cache.setdefault(sub_job_id, dict())
         cache[sub_job_id].setdefault(requirement, dict())
         with open(file_name, 'w', encoding='utf8') as fp:
-            json.dump(cache[sub_job_id][requirement], fp)
+            # Covered function names are stored in sets.
+            json.dump(cache[sub_job_id][requirement], fp, default=list)
 
     def __clean_data(self, cache, job_id, requirement):
         cache[job_id].pop(requirement, None)
@@ -315,6 +286,8 @@ class LCOV:
     FUNCTION_PREFIX = "FNDA:"
     LINE_PREFIX = "DA:"
     EOR_PREFIX = "end_of_record"
+    LINE_DIRECTIVE_PREFIX = "#line"
+    LINE_DIRECTIVE = re.compile(r'#line\s+(\d+)\s*(.*)')
 
     def __init__(self, conf, logger, coverage_file, clade, source_dirs, search_dirs, main_work_dir, coverage_details,
                  coverage_id, coverage_info_dir, verification_task_files):
@@ -356,10 +329,22 @@ class LCOV:
 
         # Parse coverage file.
         coverage_info = {}
-        line_map = {}
         func_map = {}
         func_reverse_map = {}
 
+        # Map of CIL source file lines to original source files and lines. It is kept in arrays indexed by CIL source
+        # file line numbers since dictionaries of tuples take too much memory for large CIL source files. Original
+        # source file names are stored just once.
+        orig_files = [None]
+        orig_file_ids = {None: 0}
+        line_map_files = array.array('i')
+        line_map_lines = array.array('l')
+
+        def get_orig_file_and_line(cil_src_line):
+            if 0 < cil_src_line <= len(line_map_files) and line_map_files[cil_src_line - 1] >= 0:
+                return orig_files[line_map_files[cil_src_line - 1]], line_map_lines[cil_src_line - 1]
+            return None
+
         def init_file_coverage_info(file):
             if file not in coverage_info:
                 coverage_info[file] = {
@@ -383,19 +368,25 @@ class LCOV:
 
             # Build C source files line map.
             with open(cil_src_file_name) as cil_fp:
-                line_num = 1
-                orig_file = None
+                orig_file_id = 0
                 orig_file_line_num = 0
                 for line in cil_fp:
-                    m = re.match('#line\s+(\d+)\s*(.*)', line)
+                    m = self.LINE_DIRECTIVE.match(line) if line.startswith(self.LINE_DIRECTIVE_PREFIX) else None
                     if m:
                         orig_file_line_num = int(m.group(1))
                         if m.group(2):
                             orig_file = m.group(2)[1:-1]
+                            if orig_file not in orig_file_ids:
+                                orig_file_ids[orig_file] = len(orig_files)
+                                orig_files.append(orig_file)
+                            orig_file_id = orig_file_ids[orig_file]
+                        # Line directives are not mapped.
+                        line_map_files.append(-1)
+                        line_map_lines.append(0)
                     else:
-                        line_map[line_num] = (orig_file, orig_file_line_num)
+                        line_map_files.append(orig_file_id)
+                        line_map_lines.append(orig_file_line_num)
                         orig_file_line_num += 1
-                    line_num += 1
 
             for line in fp:
                 line = line.rstrip('\n')
@@ -405,7 +396,11 @@ class LCOV:
                     cil_src_line = int(splts[0])
                     func_name = splts[1]
 
-                    orig_file, orig_line = line_map[cil_src_line]
+                    orig_file_and_line = get_orig_file_and_line(cil_src_line)
+                    if not orig_file_and_line:
+                        raise KeyError('Function {!r} is defined at unknown CIL source file line {}'
+                                       .format(func_name, cil_src_line))
+                    orig_file, orig_line = orig_file_and_line
                     func_map[func_name] = orig_file, orig_line
                     if orig_file not in func_reverse_map:
                         func_reverse_map[orig_file] = {}
@@ -429,10 +424,11 @@ class LCOV:
                     cov_num = int(splts[1])
 
                     # TODO: Coverage can contain invalid references. Let's deal with this one day!
-                    if cil_src_line not in line_map:
+                    orig_file_and_line = get_orig_file_and_line(cil_src_line)
+                    if not orig_file_and_line:
                         continue
 
-                    orig_file, orig_line = line_map[cil_src_line]
+                    orig_file, orig_line = orig_file_and_line
                     init_file_coverage_info(orig_file)
                     coverage_info[orig_file]['covered lines'][orig_line] = cov_num
                 # Finalize raw code coverage processing.
@@ -34,12 +34,23 @@ class CrossRefs:
         self.common_prefix = common_prefix
 
     def get_cross_refs(self):
+        cross_ref = self.get_index_data()
+        if cross_ref:
+            with open(os.path.join(self.new_file_name + '.idx.json'), 'w') as fp:
+                klever.core.utils.json_dump(cross_ref, fp, self.conf['keep intermediate files'])
+
+    def get_index_data(self):
+        """
+        Get cross references and highlighting for the source file without storing them.
+
+        :return: Dictionary with index data or None if the source file can not be analyzed.
+        """
         with open(self.new_file_name) as fp:
             try:
                 src = fp.read()
             # Source files with non UTF-8 encoding will not be analyzed. There should not be many such source files.
             except UnicodeDecodeError:
-                return
+                return None
 
         highlight = Highlight(self.logger, src)
         highlight.highlight()
@@ -182,7 +193,7 @@ class CrossRefs:
         highlight.extra_highlight([['FuncCallRefFrom', *r[0]] for r in refs_from_func_calls])
         highlight.extra_highlight([['MacroExpansionRefFrom', *r[0]] for r in refs_from_macro_expansions])
 
-        cross_ref = {
+        return {
             'format': self.INDEX_DATA_FORMAT_VERSION,
             'source files': short_ref_src_files,
             'referencesto': refs_to_func_defs + refs_to_macro_defs,
@@ -190,6 +201,3 @@ class CrossRefs:
             'referencesfrom': refs_from_func_calls + refs_from_macro_expansions,
             'highlight': highlight.highlights
         }
-
-        with open(os.path.join(self.new_file_name + '.idx.json'), 'w') as fp:
-            klever.core.utils.json_dump(cross_ref, fp, self.conf['keep intermediate files'])
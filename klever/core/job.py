@@ -16,6 +16,7 @@
 #
 
 import copy
+import hashlib
 import importlib
 import json
 import multiprocessing
@@ -30,6 +31,7 @@ from clade import Clade
 import klever.core.utils
 import klever.core.session
 import klever.core.components
+import klever.core.clade_service
 from klever.core.cross_refs import CrossRefs
 from klever.core.progress import PW
 from klever.core.coverage import JCR
@@ -505,6 +507,7 @@ class Job(klever.core.components.Component):
                                                                                        'additional sources')
 
         self.clade = None
+        self.original_sources_cache_dir = None
         self.components = []
         self.component_processes = []
 
@@ -534,9 +537,20 @@ class Job(klever.core.components.Component):
             with open('conf.json', 'w', encoding='utf8') as fp:
                 json.dump(self.common_components_conf, fp, ensure_ascii=False, sort_keys=True, indent=4)
 
-        self.__get_job_or_sub_job_components()
-        self.callbacks = klever.core.components.get_component_callbacks(self.logger, [type(self)] + self.components)
-        self.launch_sub_job_components()
+        # Load build base just once for all components that need it.
+        clade_service = None
+        if self.common_components_conf.get('use Clade query service', True):
+            clade_service = klever.core.clade_service.start_service(self.logger, self.common_components_conf)
+
+        try:
+            self.__get_job_or_sub_job_components()
+            self.callbacks = klever.core.components.get_component_callbacks(self.logger,
+                                                                            [type(self)] + self.components)
+            self.launch_sub_job_components()
+        finally:
+            if clade_service:
+                self.logger.info('Stop Clade query service')
+                clade_service.shutdown()
 
         self.clean_dir = True
         self.logger.info("All components finished")
@@ -639,6 +653,7 @@ class Job(klever.core.components.Component):
             file_name = self.mqs['file names'].get()
 
             if not file_name:
+                self.mqs['original sources'].put(None)
                 return
 
             src_file_name = klever.core.utils.make_relative_path(self.common_components_conf['working source trees'],
@@ -647,14 +662,72 @@ class Job(klever.core.components.Component):
             if src_file_name != file_name:
                 src_file_name = os.path.join('source files', src_file_name)
 
-            new_file_name = os.path.join('original sources', src_file_name.lstrip(os.path.sep))
-            os.makedirs(os.path.dirname(new_file_name), exist_ok=True)
-            shutil.copy(self.clade.get_storage_path(file_name), new_file_name)
+            storage_file_name = self.clade.get_storage_path(file_name)
+            self.mqs['original sources'].put((storage_file_name, src_file_name.lstrip(os.path.sep),
+                                              self.__get_index_data(file_name, storage_file_name)))
+
+    def __get_index_data(self, file_name, storage_file_name):
+        # Index data depends just on the source file, on the build base and on working source trees. The build base is
+        # fixed by the cache directory, so the rest is encoded by the cache key.
+        cache_file = None
+        if self.original_sources_cache_dir:
+            key = hashlib.sha256(json.dumps([CrossRefs.INDEX_DATA_FORMAT_VERSION, file_name,
+                                             klever.core.utils.get_file_checksum(storage_file_name),
+                                             self.common_components_conf['working source trees']]).encode('utf8'))
+            cache_file = os.path.join(self.original_sources_cache_dir, key.hexdigest() + '.idx.json')
+
+            if os.path.isfile(cache_file):
+                with open(cache_file) as fp:
+                    return json.load(fp)
+
+        cross_refs = CrossRefs(self.common_components_conf, self.logger, self.clade,
+                               file_name, storage_file_name,
+                               self.common_components_conf['working source trees'], 'source files')
+        index_data = cross_refs.get_index_data()
+        index_data = json.dumps(index_data, ensure_ascii=True) if index_data else None
+
+        if cache_file:
+            # Other workers and jobs can store the same cache file simultaneously, so replace it atomically.
+            with open(cache_file + '.{0}.tmp'.format(os.getpid()), 'w') as fp:
+                json.dump(index_data, fp)
+            os.replace(cache_file + '.{0}.tmp'.format(os.getpid()), cache_file)
+
+        return index_data
+
+    def __write_original_sources(self):
+        finished_workers = 0
+        with open('original sources.zip', mode='w+b', buffering=0) as f:
+            with zipfile.ZipFile(f, mode='w', compression=zipfile.ZIP_DEFLATED) as zfp:
+                while finished_workers < self.workers_num:
+                    original_source = self.mqs['original sources'].get()
+
+                    if not original_source:
+                        finished_workers += 1
+                        continue
+
+                    storage_file_name, arcname, index_data = original_source
+                    zfp.write(storage_file_name, arcname=arcname)
+                    if index_data:
+                        zfp.writestr(arcname + '.idx.json', index_data)
+
+                os.fsync(zfp.fp)
+
+    def __get_original_sources_cache_dir(self, src_id):
+        # Keep cache within the build base since it is tightly bound to it and can be reused by all jobs that use the
+        # same build base.
+        cache_dir = os.path.join(self.common_components_conf['build base'], 'klever cache', 'original sources', src_id)
+
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError as e:
+            self.logger.warning('Can not create cache directory "{0}": {1}'.format(cache_dir, e))
+            return None
+
+        if not os.access(cache_dir, os.W_OK):
+            self.logger.warning('Cache directory "{0}" is not writable'.format(cache_dir))
+            return None
 
-            cross_refs = CrossRefs(self.common_components_conf, self.logger, self.clade,
-                                   file_name, new_file_name,
-                                   self.common_components_conf['working source trees'], 'source files')
-            cross_refs.get_cross_refs()
+        return cache_dir
 
     def __get_original_sources_basic_info(self):
         self.logger.info('Get information on original sources for following visualization of uncovered source files')
@@ -701,23 +774,40 @@ class Job(klever.core.components.Component):
             self.__refer_original_sources(src_id)
             return
 
-        self.logger.info(
-            'Cut off working source trees or build directory from original source file names and convert index data')
-        os.makedirs('original sources')
-        self.mqs['file names'] = multiprocessing.Queue()
-        self.workers_num = klever.core.utils.get_parallel_threads_num(self.logger, self.conf)
-        subcomponents = [('PSFS', self.__process_source_files)]
-        for i in range(self.workers_num):
-            subcomponents.append(('RSF', self.__process_source_file))
-        self.launch_subcomponents(False, *subcomponents)
-        self.mqs['file names'].close()
-
-        self.logger.info('Compress original sources')
-        klever.core.utils.ArchiveFiles(['original sources']).make_archive('original sources.zip')
+        self.original_sources_cache_dir = self.__get_original_sources_cache_dir(src_id)
+        # Original sources archive depends on working source trees and on the index data format besides the build base.
+        cached_archive = None
+        if self.original_sources_cache_dir:
+            cached_archive = os.path.join(
+                self.original_sources_cache_dir,
+                hashlib.sha256(json.dumps([CrossRefs.INDEX_DATA_FORMAT_VERSION,
+                                           self.common_components_conf['working source trees']]).encode('utf8'))
+                .hexdigest() + '.zip')
+
+        if cached_archive and os.path.isfile(cached_archive):
+            self.logger.info('Use cached original sources archive "{0}"'.format(cached_archive))
+            archive = cached_archive
+        else:
+            self.logger.info('Cut off working source trees or build directory from original source file names,'
+                             ' convert index data and compress original sources')
+            self.mqs['file names'] = multiprocessing.Queue()
+            self.mqs['original sources'] = multiprocessing.Queue()
+            self.workers_num = klever.core.utils.get_parallel_threads_num(self.logger, self.conf)
+            subcomponents = [('PSFS', self.__process_source_files), ('WOS', self.__write_original_sources)]
+            for i in range(self.workers_num):
+                subcomponents.append(('RSF', self.__process_source_file))
+            self.launch_subcomponents(False, *subcomponents)
+            self.mqs['file names'].close()
+            self.mqs['original sources'].close()
+            archive = 'original sources.zip'
+
+            if cached_archive:
+                shutil.copy(archive, cached_archive + '.{0}.tmp'.format(os.getpid()))
+                os.replace(cached_archive + '.{0}.tmp'.format(os.getpid()), cached_archive)
 
         self.logger.info('Upload original sources')
         try:
-            session.upload_original_sources(src_id, 'original sources.zip')
+            session.upload_original_sources(src_id, archive)
         # Do not fail if there are already original sources. There may be complex data races because of checking and
         # uploading original sources archive are not atomic.
         except klever.core.session.BridgeError:
@@ -726,8 +816,7 @@ class Job(klever.core.components.Component):
 
         self.__refer_original_sources(src_id)
 
-        if not self.conf['keep intermediate files']:
-            shutil.rmtree('original sources')
+        if not self.conf['keep intermediate files'] and os.path.isfile('original sources.zip'):
             os.remove('original sources.zip')
 
     def __get_job_or_sub_job_components(self):
@@ -19,13 +19,13 @@ import os
 import glob
 
 from klever.core.utils import make_relative_path
-from klever.core.pfg.abstractions.files_repr import File
+from klever.core.pfg.abstractions.files_repr import File, FileGraph
 from klever.core.pfg.abstractions.fragments_repr import Fragment
 
 
 class Program:
 
-    def __init__(self, logger, clade, source_paths, memory_efficient_mode=False):
+    def __init__(self, logger, clade, source_paths):
         """
         The class that represents a program as different data structures: graphs of files or units. Also, it provides
         common methods to extract, modify or delete fragments and other information.
@@ -33,19 +33,22 @@ class Program:
         :param logger:
         :param clade:
         :param source_paths:
-        :param memory_efficient_mode:
         """
         self.logger = logger
         self.clade = clade
         self.source_paths = source_paths
         self._files = dict()
+        self._graph = FileGraph()
         self._fragments = dict()
+        # Reverse indexes to answer queries without scanning all files and fragments
+        self._fragments_by_file = dict()
+        self._files_by_abs_path = dict()
+        self._files_by_abs_dir = dict()
+        self._exporters = None
+        self._callers = None
         self.__divide()
-        if not memory_efficient_mode:
-            self.logger.info("Extract dependencies between files from the program callgraph")
-            # This is very memory unefficient operation, so for Linux this is an optional step to prevent consuming
-            # gigabytes of memory
-            self.__establish_dependencies()
+        self.logger.info("Extract dependencies between files from the program callgraph")
+        self.__establish_dependencies()
 
     def create_fragment(self, name, files, add=False):
         """
@@ -69,6 +72,8 @@ class Program:
     def add_fragment(self, fragment):
         if fragment.name not in self._fragments:
             self._fragments[fragment.name] = fragment
+            fragment.files.listeners.append(self.__index_fragment_files)
+            self.__index_fragment_files(fragment, fragment.files, ())
         else:
             if not self._fragments[fragment.name].files.symmetric_difference(fragment.files):
                 self.logger.warning("There are several equal fragments {!r} extracted, keep only one".
@@ -128,7 +133,9 @@ class Program:
         if name not in self._fragments:
             raise ValueError("Cannot remove already missing fragment {!r}".format(fragment.name))
         else:
-            del self._fragments[name]
+            fragment = self._fragments.pop(name)
+            fragment.files.listeners.remove(self.__index_fragment_files)
+            self.__index_fragment_files(fragment, (), fragment.files)
 
     @property
     def files(self):
@@ -208,16 +215,9 @@ class Program:
         matched = set()
         # Found files
         suitable_files = set()
-        # Optimizations: collect in advance absolute file paths
         convert = self.clade.get_storage_path
-        reversed = {f.abs_path: f for f in self.files}
-        all_abs_files = set(reversed.keys())
-        all_abs_dirs = dict()
-        for file in all_abs_files:
-            dirname = os.path.dirname(file)
-            if dirname not in all_abs_dirs:
-                all_abs_dirs[dirname] = set()
-            all_abs_dirs[dirname].add(file)
+        reversed = self._files_by_abs_path
+        all_abs_dirs = self._files_by_abs_dir
         matched_abs_files = set()
 
         # First try globes
@@ -234,7 +234,7 @@ class Program:
                     if file in matched_abs_files:
                         continue
 
-                    if file in all_abs_files:
+                    if file in reversed:
                         matched_abs_files.add(file)
                         suitable_files.add(reversed[file])
                         if not suits:
@@ -254,11 +254,13 @@ class Program:
         # Check function names
         rest = expressions.difference(matched)
         if rest:
-            for file in (f for f in self.files if f not in suitable_files):
-                matched_funcs = set(file.export_functions.keys()).intersection(rest)
-                if matched_funcs:
-                    suitable_files.add(file)
-                    matched.update(matched_funcs)
+            exporters = self.__get_exporters()
+            matched_files = set(suitable_files)
+            for func in rest:
+                files = exporters.get(func, set()).difference(matched_files)
+                if files:
+                    suitable_files.update(files)
+                    matched.add(func)
 
         return suitable_files, matched
 
@@ -295,11 +297,8 @@ class Program:
         :return: Set of Fragment objects.
         """
         frags = set()
-        files = {f if isinstance(f, str) else f.name for f in files}
-        if files:
-            for frag in self.fragments:
-                if {f.name for f in frag.files}.intersection(files):
-                    frags.add(frag)
+        for file in files:
+            frags.update(self._fragments_by_file.get(file if isinstance(file, str) else file.name, ()))
         return frags
 
     def get_files_calling_functions(self, functions):
@@ -311,9 +310,9 @@ class Program:
         """
         files = set()
         if functions:
-            for file in self.files:
-                if set(file.import_functions.keys()).intersection(functions):
-                    files.add(file)
+            callers = self.__get_callers()
+            for func in functions:
+                files.update(callers.get(func, ()))
         return files
 
     def collect_dependencies(self, files, filter_func=lambda x: True, depth=None, max=None):
@@ -376,6 +375,53 @@ class Program:
                     except (KeyError, IndexError):
                         file.size = 0
                     self._files[name] = file
+                    self._graph.add_file(file)
+                    self._files_by_abs_path[file.abs_path] = file
+                    self._files_by_abs_dir.setdefault(os.path.dirname(file.abs_path), set()).add(file.abs_path)
+
+    def __index_fragment_files(self, fragment, added, removed):
+        """
+        Keep the index of fragments by their files up to date.
+
+        :param fragment: Fragment object.
+        :param added: File objects added to the fragment.
+        :param removed: File objects removed from the fragment.
+        """
+        for file in removed:
+            frags = self._fragments_by_file.get(file.name)
+            if frags:
+                frags.discard(fragment)
+                if not frags:
+                    del self._fragments_by_file[file.name]
+        for file in added:
+            self._fragments_by_file.setdefault(file.name, set()).add(fragment)
+
+    def __get_exporters(self):
+        """
+        Get the index of files by names of functions they export. Exported functions do not change after dependencies
+        are established, so the index is built once on demand.
+
+        :return: Dictionary with sets of File objects.
+        """
+        if self._exporters is None:
+            self._exporters = dict()
+            for file in self.files:
+                for func in file.export_functions:
+                    self._exporters.setdefault(func, set()).add(file)
+        return self._exporters
+
+    def __get_callers(self):
+        """
+        Get the index of files by names of functions they import. It is built once on demand as the index of exporters.
+
+        :return: Dictionary with sets of File objects.
+        """
+        if self._callers is None:
+            self._callers = dict()
+            for file in self.files:
+                for func in file.import_functions:
+                    self._callers.setdefault(func, set()).add(file)
+        return self._callers
 
     def __check_cc(self, desc):
         """
@@ -389,20 +435,24 @@ class Program:
     def __establish_dependencies(self):
         """
         Analyze the callgraph of the program and add to each File object function names that are exported and function
-        names that are imported with links to File objects that export these functions. This function requires an
-        extremely huge amount of memory if the program is very big. This is because the callgraph itself can be quite
-        large.
+        names that are imported with links to File objects that export these functions. The callgraph is loaded file
+        by file since it can be quite large for big programs, and dependencies are stored within the compact graph.
         """
-        cg = self.clade.callgraph
         fs = self.clade.functions_by_file
 
         # Fulfil callgraph dependencies
-        for path, functions in ((p, f) for p, f in cg.items() if p in self._files):
+        for path, data in self.clade.Callgraph.yield_callgraph():
+            if path not in self._files:
+                continue
+
             file_repr = self._files[path]
-            for func, func_desc in functions.items():
+            # Imported functions with files exporting them and corresponding match scores.
+            imports = dict()
+            successors = set()
+            for func, func_desc in data[path].items():
                 tp = func_desc.get('type', 'static')
                 if tp != 'static':
-                    file_repr.add_export_function(func)
+                    self._graph.add_export_function(file_repr, func)
 
                 for called_definition_scope, called_functions in \
                         ((s, d) for s, d in func_desc.get('calls', dict()).items()
@@ -413,7 +463,12 @@ class Program:
                                             if fs.get(called_definition_scope, dict()).get(c, dict()).
                                             get('type', 'static') != 'static'):
                         match_score = list(called_functions[called_function].values())[0]["match_type"]
-                        file_repr.add_import_function(called_function, called_definition_file, match_score)
+                        # Prefer the best match if functions can be imported from several files.
+                        if called_function not in imports or imports[called_function][1] < match_score:
+                            imports[called_function] = (called_definition_file, match_score)
+                            successors.add(called_definition_file)
+
+            self._graph.set_import_functions(file_repr, {f: desc[0] for f, desc in imports.items()}, successors)
 
         # Add rest global functions
         for path, functions in ((p, f) for p, f in fs.items() if p in self._files):
@@ -421,4 +476,6 @@ class Program:
             for func, func_desc in functions.items():
                 tp = func_desc.get('type', 'static')
                 if tp != 'static':
-                    file_repr.add_export_function(func)
+                    self._graph.add_export_function(file_repr, func)
+
+        self._graph.build()
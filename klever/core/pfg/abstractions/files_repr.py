@@ -15,8 +15,13 @@
 # limitations under the License.
 #
 
+import array
+import bisect
+
 
 class File:
+    # There are plenty of files in large programs, so objects do not have dictionaries of attributes.
+    __slots__ = ('name', 'id', '_graph', 'abs_path', 'cmd_id', 'cmd_type', 'size', 'target', 'unique')
 
     def __init__(self, name):
         """
@@ -27,33 +32,33 @@ class File:
         # Identifier
         self.name = name
 
-        # Here we will store links to callgraph and definition scopes data
-        self._export_functions = dict()
-        self._import_functions = dict()
-        self._predecessors = set()
-        self._successors = set()
+        # Dependencies between files are stored within the graph of the program where the file is referred by the
+        # integer identifier.
+        self.id = None
+        self._graph = None
         self.abs_path = None
-        self.cmd_id = None,
-        self.cmd_type = None,
+        self.cmd_id = None
+        self.cmd_type = None
         self.size = 0
         self.target = False
         self.unique = True
 
+    # Collections below are views of the graph of the program, they are not copied on access.
     @property
     def successors(self):
-        return set(self._successors)
+        return self._graph.successors(self.id) if self._graph else ()
 
     @property
     def predecessors(self):
-        return set(self._predecessors)
+        return self._graph.predecessors(self.id) if self._graph else ()
 
     @property
     def export_functions(self):
-        return dict(self._export_functions)
+        return self._graph.export_functions(self.id) if self._graph else ()
 
     @property
     def import_functions(self):
-        return {f: desc[0] for f, desc in self._import_functions.items()}
+        return self._graph.import_functions(self.id) if self._graph else ()
 
     def __lt__(self, other):
         return self.name < other.name
@@ -73,55 +78,188 @@ class File:
     def __cmp__(self, rhs):
         return self.name.__cmp__(rhs.name)
 
-    def add_predecessor(self, predecessor):
+    def imports_function(self, function_name):
+        """
+        Check that the file imports the function.
+
+        :param function_name: Function name.
+        :return: True or False.
+        """
+        return function_name in self.import_functions
+
+
+class _GraphRow:
+    # Rows are created on each access to dependencies, so they should be as light as possible.
+    __slots__ = ('_graph', '_values', '_start', '_end')
+
+    def __init__(self, graph, csr, file_id):
+        """
+        Read-only view of a row of the graph stored within compressed sparse row arrays. Values of rows are sorted
+        identifiers of files or functions.
+
+        :param graph: FileGraph object.
+        :param csr: Pair of arrays with offsets of rows and their values.
+        :param file_id: Identifier of the file which row is viewed.
+        """
+        self._graph = graph
+        self._values = csr[1]
+        self._start = csr[0][file_id]
+        self._end = csr[0][file_id + 1]
+
+    def __iter__(self):
+        items = self._get_items()
+        for i in range(self._start, self._end):
+            yield items[self._values[i]]
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __contains__(self, item):
+        identifier = self._get_identifier(item)
+        if identifier is None:
+            return False
+        i = bisect.bisect_left(self._values, identifier, self._start, self._end)
+        return i < self._end and self._values[i] == identifier
+
+    def _get_items(self):
+        raise NotImplementedError
+
+    def _get_identifier(self, item):
+        raise NotImplementedError
+
+
+class _FilesRow(_GraphRow):
+    __slots__ = ()
+
+    def _get_items(self):
+        return self._graph.files
+
+    def _get_identifier(self, item):
+        return item.id if item._graph is self._graph else None
+
+
+class _FunctionsRow(_GraphRow):
+    __slots__ = ()
+
+    def _get_items(self):
+        return self._graph.functions
+
+    def _get_identifier(self, item):
+        return self._graph.function_ids.get(item)
+
+
+class FileGraph:
+
+    def __init__(self):
+        """
+        Dependencies between files of the program. Files and functions are represented by integer identifiers and
+        dependencies are stored within compressed sparse row arrays (offsets of rows and their values), so the graph
+        is affordable for large programs like Linux.
+        """
+        self.files = []
+        self.functions = []
+        self.function_ids = dict()
+        # Dependencies collected before the graph is built.
+        self._pending_exports = dict()
+        self._pending_imports = dict()
+        self._successors = None
+        self._predecessors = None
+        self._exports = None
+        self._imports = None
+
+    def add_file(self, file):
+        """
+        Add the file to the graph.
+
+        :param file: File object.
+        """
+        file.id = len(self.files)
+        file._graph = self
+        self.files.append(file)
+
+    def get_function_id(self, name):
         """
-        Add a predecessor - the file that calls functions from this one.
+        Get the identifier of the function adding it if necessary.
 
-        :param predecessor: File object.
+        :param name: Function name.
+        :return: Integer.
         """
-        # Just ignore linking to self
-        if predecessor.name != self.name:
-            self._predecessors.add(predecessor)
-            predecessor._successors.add(self)
+        func_id = self.function_ids.get(name)
+        if func_id is None:
+            func_id = self.function_ids[name] = len(self.functions)
+            self.functions.append(name)
+        return func_id
 
-    def add_successor(self, successor):
+    def add_export_function(self, file, function_name):
         """
-        Add a successor - the file that exports functions to this one.
+        Add an exported function. Files that import this function can be found among predecessors.
 
-        :param successor: File object.
+        :param file: File object.
+        :param function_name: Function name.
         """
-        # Just ignore linking to self
-        if successor.name != self.name:
-            self._successors.add(successor)
-            successor._predecessors.add(self)
+        self._pending_exports.setdefault(file.id, set()).add(self.get_function_id(function_name))
 
-    def add_export_function(self, function_name, user_files=None):
+    def set_import_functions(self, file, imports, successors):
         """
-        Add an exported function.
+        Set all functions imported by the file at once. Imported functions are exported by corresponding files.
 
-        :param function_name: Function name
-        :param user_files: None or a set of File objects that import this function.
+        :param file: File object.
+        :param imports: Dictionary from function names to File objects that export them.
+        :param successors: File objects that export functions to the file.
         """
-        # Just ignore linking to self
-        if function_name not in self._export_functions:
-            self._export_functions[function_name] = set()
-        if user_files:
-            self._export_functions[function_name].update(user_files)
+        if file.name in (f.name for f in imports.values()):
+            raise ValueError("Cannot import functions from itself: {!r}".format(file.name))
+
+        func_ids = []
+        for func, scope in imports.items():
+            func_id = self.get_function_id(func)
+            func_ids.append(func_id)
+            self._pending_exports.setdefault(scope.id, set()).add(func_id)
+        self._pending_imports[file.id] = (sorted(func_ids), sorted(f.id for f in successors))
+
+    def build(self):
+        """Convert collected dependencies to compressed sparse row arrays."""
+        num = len(self.files)
+        no_imports = ((), ())
+
+        self._exports = self.__get_csr(sorted(self._pending_exports.get(i, ())) for i in range(num))
+        self._imports = self.__get_csr(self._pending_imports.get(i, no_imports)[0] for i in range(num))
+        self._successors = self.__get_csr(self._pending_imports.get(i, no_imports)[1] for i in range(num))
+        self._pending_exports = None
+        self._pending_imports = None
+
+        # Predecessors are obtained by transposing successors. Values of their rows are sorted as well.
+        offsets, values = self._successors
+        pred_offsets = array.array('l', [0]) * (num + 1)
+        for value in values:
+            pred_offsets[value + 1] += 1
+        for i in range(num):
+            pred_offsets[i + 1] += pred_offsets[i]
+        pred_values = array.array('i', [0]) * len(values)
+        positions = array.array('l', pred_offsets)
+        for i in range(num):
+            for j in range(offsets[i], offsets[i + 1]):
+                pred_values[positions[values[j]]] = i
+                positions[values[j]] += 1
+        self._predecessors = (pred_offsets, pred_values)
+
+    def successors(self, file_id):
+        return _FilesRow(self, self._successors, file_id) if self._successors else ()
+
+    def predecessors(self, file_id):
+        return _FilesRow(self, self._predecessors, file_id) if self._predecessors else ()
+
+    def export_functions(self, file_id):
+        return _FunctionsRow(self, self._exports, file_id) if self._exports else ()
 
-    def add_import_function(self, function_name, definition_scope, match_score):
-        if definition_scope.name == self.name:
-            raise ValueError("Cannot import function {!r} from itself: {!r}".format(function_name, self.name))
+    def import_functions(self, file_id):
+        return _FunctionsRow(self, self._imports, file_id) if self._imports else ()
 
-        if function_name not in self._import_functions:
-            self._import_functions[function_name] = [definition_scope, match_score]
-            definition_scope.add_export_function(function_name, {self})
-            self.add_successor(definition_scope)
-        else:
-            # todo: maybe add logger there? But this is not a good place to debug the callgraph
-            # self.logger.warning('Cannot import function {!r} from two places: {!r} and {!r}'.
-            #                     format(function_name, self._import_functions[function_name][0],
-            #                            definition_scope.name))
-            if self._import_functions[function_name][1] < match_score:
-                self._import_functions[function_name] = [definition_scope, match_score]
-                definition_scope.add_export_function(function_name, {self})
-                self.add_successor(definition_scope)
+    @staticmethod
+    def __get_csr(rows):
+        offsets = array.array('l', [0])
+        values = array.array('i')
+        for row in rows:
+            values.extend(row)
+            offsets.append(len(values))
+        return offsets, values
@@ -16,6 +16,86 @@
 #
 
 
+class FragmentFiles(set):
+    """
+    Set of files of a fragment. It notifies subscribers about each change so that they could keep their indexes up to
+    date without scanning all fragments.
+    """
+
+    def __init__(self, fragment):
+        super().__init__()
+        self.fragment = fragment
+        self.listeners = []
+
+    def __notify(self, added=(), removed=()):
+        if added or removed:
+            for listener in self.listeners:
+                listener(self.fragment, added, removed)
+
+    def add(self, file):
+        if file not in self:
+            super().add(file)
+            self.__notify(added=(file,))
+
+    def discard(self, file):
+        if file in self:
+            super().discard(file)
+            self.__notify(removed=(file,))
+
+    def remove(self, file):
+        super().remove(file)
+        self.__notify(removed=(file,))
+
+    def pop(self):
+        file = super().pop()
+        self.__notify(removed=(file,))
+        return file
+
+    def clear(self):
+        removed = set(self)
+        super().clear()
+        self.__notify(removed=removed)
+
+    def update(self, *others):
+        added = set().union(*others).difference(self)
+        super().update(added)
+        self.__notify(added=added)
+
+    def difference_update(self, *others):
+        removed = self.intersection(set().union(*others))
+        super().difference_update(removed)
+        self.__notify(removed=removed)
+
+    def intersection_update(self, *others):
+        removed = self.difference(self.intersection(*others))
+        super().difference_update(removed)
+        self.__notify(removed=removed)
+
+    def symmetric_difference_update(self, other):
+        other = set(other)
+        removed = self.intersection(other)
+        added = other.difference(self)
+        super().difference_update(removed)
+        super().update(added)
+        self.__notify(added=added, removed=removed)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
+
 class Fragment:
     """Represent a program fragment - a set of files."""
 
@@ -29,7 +109,7 @@ class Fragment:
         self.name = identifier
 
         # Description of the module content
-        self.files = set()
+        self.files = FragmentFiles(self)
 
     def __lt__(self, other):
         return self.name < other.id
@@ -75,13 +75,7 @@ class FragmentationAlgorythm:
         """
         # Extract dependencies
         self.logger.info("Start program fragmentation")
-        if self.tactic.get('ignore dependencies'):
-            self.logger.info("Use memory efficient mode with limitied dependencies extraction")
-            memory_efficient_mode = True
-        else:
-            self.logger.info("Extract full dependencies between files and functions")
-            memory_efficient_mode = False
-        deps = Program(self.logger, self.clade, self.source_paths, memory_efficient_mode=memory_efficient_mode)
+        deps = Program(self.logger, self.clade, self.source_paths)
 
         # Decompose using units
         self.logger.info("Determine units in the target program")
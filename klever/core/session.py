@@ -15,13 +15,40 @@
 # limitations under the License.
 #
 
+import gzip
 import json
 import os
+import random
 import requests
 import time
 import zipfile
 
 
+# Delays between attempts to connect to Bridge grow exponentially up to the maximum one.
+RECONNECT_INITIAL_DELAY = 0.2
+RECONNECT_MAX_DELAY = 30
+# The number of tasks that are accumulated to remove them by one request.
+REMOVE_TASKS_BATCH = 100
+
+# Tokens are shared by all sessions of the process. Child processes inherit tokens, so all components of the job use
+# the token obtained by Core and do not sign in themselves.
+_tokens = dict()
+# HTTP sessions keep connections alive between requests. Connections can not be shared with parent processes, so each
+# process has its own HTTP session.
+_http_session = None
+_http_session_pid = None
+
+
+def _get_http_session():
+    global _http_session, _http_session_pid
+
+    if _http_session_pid != os.getpid():
+        _http_session = requests.Session()
+        _http_session_pid = os.getpid()
+
+    return _http_session
+
+
 class UnexpectedStatusCode(IOError):
     pass
 
@@ -44,14 +71,22 @@ class Session:
             'username': bridge['user'],
             'password': bridge['password']
         }
+        self.__headers = dict()
+        self.__tasks_to_remove = []
 
         # Sign in.
         self.__signin()
 
     def __signin(self):
-        self.session = requests.Session()
-        resp = self.__request('service/get_token/', 'POST', data=self.__parameters)
-        self.session.headers.update({'Authorization': 'Token {}'.format(resp.json()['token'])})
+        self.session = _get_http_session()
+        token = _tokens.get((self.name, self.__parameters['username']))
+        if token:
+            self.logger.debug('Use existing token')
+        else:
+            resp = self.__request('service/get_token/', 'POST', data=self.__parameters)
+            token = resp.json()['token']
+            _tokens[(self.name, self.__parameters['username'])] = token
+        self.__headers = {'Authorization': 'Token {}'.format(token)}
         self.logger.debug('Session was created')
 
     def __request(self, path_url, method, **kwargs):
@@ -61,9 +96,10 @@ class Session:
 
         self.logger.debug('Send "{0}" request to "{1}"'.format(method, url))
 
+        attempts = 0
         while True:
             try:
-                resp = self.session.request(method, url, **kwargs)
+                resp = self.session.request(method, url, headers=self.__headers, **kwargs)
 
                 if resp.status_code not in (200, 201, 204):
                     if resp.headers['content-type'] == 'application/json':
@@ -80,8 +116,13 @@ class Session:
                                                                                                    method, url))
                 return resp
             except requests.ConnectionError:
-                self.logger.warning('Could not send "{0}" request to "{1}"'.format(method, url))
-                time.sleep(0.2)
+                # Randomize delays to avoid simultaneous attempts of many processes to connect to restarted Bridge.
+                delay = min(RECONNECT_MAX_DELAY, RECONNECT_INITIAL_DELAY * 2 ** attempts)
+                delay = random.uniform(delay / 2, delay)
+                attempts = min(attempts + 1, 16)
+                self.logger.warning('Could not send "{0}" request to "{1}", try again in {2:.1f} seconds'
+                                    .format(method, url, delay))
+                time.sleep(delay)
 
     def start_job_decision(self, job_format, archive):
         self.__download_archive('job', 'jobs/api/download-files/' + self.job_id,
@@ -109,6 +150,18 @@ class Session:
         resp = self.__request('service/tasks/?job={}&fields=status&fields=id'.format(self.job_id), method='GET')
         return resp.json()
 
+    def get_changed_tasks_statuses(self, cursor=None):
+        """
+        Get statuses of tasks that were changed since the given cursor.
+
+        :param cursor: Cursor returned by previous call or None to get statuses of all tasks.
+        :return: List of changed tasks statuses and a cursor for next call.
+        """
+        resp = self.__request('service/tasks-changes/{}/{}'.format(
+            self.job_id, '?since={}'.format(cursor) if cursor is not None else ''), method='GET')
+        changes = resp.json()
+        return changes['tasks'], changes['cursor']
+
     def get_task_error(self, task_id):
         resp = self.__request('service/tasks/{}/?fields=error'.format(task_id), method='GET')
         return resp.json()['error']
@@ -118,9 +171,28 @@ class Session:
                                 archive='decision result files.zip')
 
     def remove_task(self, task_id):
-        self.__request('service/tasks/{}/'.format(task_id), method='DELETE')
+        """
+        Remove the task. Tasks are accumulated and removed by batches, remaining ones are removed on signing out.
+
+        :param task_id: Task identifier.
+        """
+        self.__tasks_to_remove.append(task_id)
+        if len(self.__tasks_to_remove) >= REMOVE_TASKS_BATCH:
+            self.remove_tasks(self.__tasks_to_remove)
+            self.__tasks_to_remove = []
+
+    def remove_tasks(self, task_ids):
+        """
+        Remove several tasks by one request.
+
+        :param task_ids: Task identifiers.
+        """
+        self.__request('service/tasks-remove/{}/'.format(self.job_id), 'POST', json={'tasks': list(task_ids)})
 
     def sign_out(self):
+        if self.__tasks_to_remove:
+            self.remove_tasks(self.__tasks_to_remove)
+            self.__tasks_to_remove = []
         self.logger.info('Finish session')
 
     def upload_original_sources(self, src_id, src_archive):
@@ -132,22 +204,26 @@ class Session:
         batch_reports = []
         batch_report_file_archives = []
         for report_and_report_file_archives in reports_and_report_file_archives:
-            with open(report_and_report_file_archives['report file'], encoding='utf8') as fp:
-                batch_reports.append(json.load(fp))
+            if 'report' in report_and_report_file_archives:
+                batch_reports.append(report_and_report_file_archives['report'])
+            else:
+                with open(report_and_report_file_archives['report file'], encoding='utf8') as fp:
+                    batch_reports.append(json.load(fp))
 
             report_file_archives = report_and_report_file_archives.get('report file archives')
             if report_file_archives:
                 batch_report_file_archives.extend(report_file_archives)
 
-        # TODO: report is likely should be compressed.
-        self.__upload_archives('reports/api/upload/{0}/'.format(self.job_id),
-                               {'reports': json.dumps(batch_reports)},
-                               {os.path.basename(archive): archive for archive in batch_report_file_archives})
+        # Reports are compressed since they can be quite large and similar to each other.
+        compressed_reports = gzip.compress(json.dumps(batch_reports).encode('utf8'))
+        self.__upload_archives('reports/api/upload/{0}/'.format(self.job_id), {},
+                               {os.path.basename(archive): archive for archive in batch_report_file_archives},
+                               {'reports': ('reports.json.gz', compressed_reports)})
 
         # We can safely remove task and its files after uploading report referencing task files.
-        for report in batch_reports:
-            if 'task identifier' in report:
-                self.remove_task(report['task identifier'])
+        task_ids = [report['task identifier'] for report in batch_reports if 'task identifier' in report]
+        if task_ids:
+            self.remove_tasks(task_ids)
 
     def submit_progress(self, progress):
         self.logger.info('Submit solution progress')
@@ -172,14 +248,15 @@ class Session:
                 if resp:
                     resp.close()
 
-    def __upload_archives(self, path_url, data, archives):
+    def __upload_archives(self, path_url, data, archives, data_files=None):
         while True:
             resp = None
             try:
-                resp = self.__request(path_url, 'POST', data=data,
-                                      files={archive_name: open(archive_path, 'rb', buffering=0)
-                                             for archive_name, archive_path in archives.items()},
-                                      stream=True)
+                files = {archive_name: open(archive_path, 'rb', buffering=0)
+                         for archive_name, archive_path in archives.items()}
+                if data_files:
+                    files.update(data_files)
+                resp = self.__request(path_url, 'POST', data=data, files=files, stream=True)
                 return resp.json()
             except BridgeError:
                 if 'ZIP error' in self.error:
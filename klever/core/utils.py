@@ -19,6 +19,7 @@ import fcntl
 import json
 import hashlib
 import logging
+import multiprocessing.connection
 import os
 import re
 import subprocess
@@ -702,6 +703,18 @@ def drain_queue(collection, given_queue):
         return True
 
 
+def wait_for_queues(queues, timeout=None):
+    """
+    Wait until at least one of the given queues gets elements.
+
+    :param queues: List of multiprocessing.Queue.
+    :param timeout: Maximum time to wait in seconds or None to wait without a limit.
+    :return: False - timeout expired, True - otherwise
+    """
+    # Queues do not allow to wait for several of them at once, but their pipes do.
+    return bool(multiprocessing.connection.wait([q._reader for q in queues], timeout))
+
+
 def json_dump(obj, fp, pretty=True):
     """
     Save JSON file.
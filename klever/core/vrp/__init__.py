@@ -26,12 +26,11 @@ import xml.etree.ElementTree as ElementTree
 import zipfile
 import multiprocessing
 
-from clade import Clade
-
 from klever.core.vrp.et import import_error_trace
 
 import klever.core.components
 import klever.core.session
+import klever.core.clade_service
 import klever.core.utils
 from klever.core.coverage import LCOV
 
@@ -96,6 +95,9 @@ class VRP(klever.core.components.Component):
 
     def __result_processing(self):
         pending = dict()
+        solved = dict()
+        processed = set()
+        cursor = None
         # todo: implement them in GUI
         solution_timeout = 1
         generation_timeout = 1
@@ -139,20 +141,24 @@ class VRP(klever.core.components.Component):
 
                 # Plan for processing new tasks
                 if len(pending) > 0:
-                    tasks_statuses = session.get_tasks_statuses()
+                    # Bridge returns just tasks which statuses were changed since the previous request. Remember
+                    # final statuses since tasks can be solved before they become pending here. Bridge returns
+                    # statuses changed a bit earlier than the cursor once again, so skip tasks processed already.
+                    tasks_statuses, cursor = session.get_changed_tasks_statuses(cursor)
                     for item in tasks_statuses:
-                        task = str(item['id'])
-                        if task in pending.keys():
-                            if item['status'] == 'FINISHED':
-                                submit_processing_task('FINISHED', task)
-                                del pending[task]
-                            elif item['status'] == 'ERROR':
-                                submit_processing_task('error', task)
-                                del pending[task]
-                            elif item['status'] in ('PENDING', 'PROCESSING'):
-                                pass
-                            else:
-                                raise NotImplementedError('Unknown task status {!r}'.format(item['status']))
+                        if item['status'] in ('FINISHED', 'ERROR'):
+                            if str(item['id']) not in processed:
+                                solved[str(item['id'])] = item['status']
+                        elif item['status'] not in ('PENDING', 'PROCESSING'):
+                            raise NotImplementedError('Unknown task status {!r}'.format(item['status']))
+
+                    for task in [t for t in pending if t in solved]:
+                        if solved.pop(task) == 'FINISHED':
+                            submit_processing_task('FINISHED', task)
+                        else:
+                            submit_processing_task('error', task)
+                        del pending[task]
+                        processed.add(task)
 
                 if not receiving and len(pending) == 0:
                     # Wait for all rest tasks, no tasks can come currently
@@ -174,6 +180,22 @@ class VRP(klever.core.components.Component):
         qos_resource_limits = klever.core.utils.read_max_resource_limitations(self.logger, self.conf)
         self.vals['task solution triples'] = multiprocessing.Manager().dict()
 
+        # Results of many tasks are processed within this process one after another, so sign in and get Clade interface
+        # just once rather than for each task.
+        session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'])
+        clade = klever.core.clade_service.get_clade(self.logger, self.conf)
+        if not clade.work_dir_ok():
+            raise RuntimeError('Build base is not OK')
+        search_dirs = klever.core.utils.get_search_dirs(self.conf['main working directory'], abs_paths=True)
+
+        try:
+            self.__process_tasks(qos_resource_limits, session, clade, search_dirs)
+        finally:
+            session.sign_out()
+
+        self.logger.info("VRP fetcher finishes its work")
+
+    def __process_tasks(self, qos_resource_limits, session, clade, search_dirs):
         while True:
             element = self.mqs['processing tasks'].get()
             if element is None:
@@ -199,9 +221,9 @@ class VRP(klever.core.components.Component):
             try:
                 rp = RP(self.conf, self.logger, self.id, self.callbacks, self.mqs, self.vals, new_id,
                         workdir, attrs, separate_from_parent=True, qos_resource_limits=qos_resource_limits,
-                        source_paths=source_paths, element=[status, data])
-                rp.start()
-                rp.join()
+                        source_paths=source_paths, element=[status, data], session=session, clade=clade,
+                        search_dirs=search_dirs)
+                self.launch_in_process(rp)
             except klever.core.components.ComponentError:
                 self.logger.debug("RP that processed {!r}, {!r} failed".format(pf, requirement))
             finally:
@@ -209,8 +231,6 @@ class VRP(klever.core.components.Component):
                 del self.vals['task solution triples']['{}:{}'.format(pf, requirement)]
                 self.mqs['processed tasks'].put((pf, requirement, solution))
 
-        self.logger.info("VRP fetcher finishes its work")
-
     def __get_common_attrs(self):
         self.logger.info('Get common atributes')
 
@@ -225,7 +245,7 @@ class RP(klever.core.components.Component):
 
     def __init__(self, conf, logger, parent_id, callbacks, mqs, vals, id=None, work_dir=None, attrs=None,
                  separate_from_parent=False, include_child_resources=False, qos_resource_limits=None, source_paths=None,
-                 element=None):
+                 element=None, session=None, clade=None, search_dirs=None):
         # Read this in a callback
         self.element = element
         self.verdict = None
@@ -240,14 +260,11 @@ class RP(klever.core.components.Component):
                                  separate_from_parent, include_child_resources)
 
         self.clean_dir = True
-        self.session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'])
-
+        # Session and Clade interface are shared by all RPs launched by the same worker.
+        self.session = session
         # Obtain file prefixes that can be removed from file paths.
-        self.clade = Clade(self.conf['build base'])
-        if not self.clade.work_dir_ok():
-            raise RuntimeError('Build base is not OK')
-
-        self.search_dirs = klever.core.utils.get_search_dirs(self.conf['main working directory'], abs_paths=True)
+        self.clade = clade
+        self.search_dirs = search_dirs
 
     def fetcher(self):
         self.logger.info("VRP instance is ready to work")
@@ -293,21 +310,18 @@ class RP(klever.core.components.Component):
         data[0] = status
         self.vals['task solution triples'][self.results_key] = data
 
-        try:
-            if status == 'finished':
-                self.process_finished_task(task_id, opts, verifier)
-                # Raise exception just here sinse the method above has callbacks.
-                if self.__exception:
-                    self.logger.warning("Raising the saved exception")
-                    raise self.__exception
-            elif status == 'error':
-                self.process_failed_task(task_id)
-                # Raise exception just here sinse the method above has callbacks.
-                raise RuntimeError('Failed to decide verification task: {0}'.format(self.task_error))
-            else:
-                raise ValueError("Unknown task {!r} status {!r}".format(task_id, status))
-        finally:
-            self.session.sign_out()
+        if status == 'finished':
+            self.process_finished_task(task_id, opts, verifier)
+            # Raise exception just here sinse the method above has callbacks.
+            if self.__exception:
+                self.logger.warning("Raising the saved exception")
+                raise self.__exception
+        elif status == 'error':
+            self.process_failed_task(task_id)
+            # Raise exception just here sinse the method above has callbacks.
+            raise RuntimeError('Failed to decide verification task: {0}'.format(self.task_error))
+        else:
+            raise ValueError("Unknown task {!r} status {!r}".format(task_id, status))
 
     main = fetcher
 
@@ -43,7 +43,6 @@ class ErrorTrace:
         self.emg_comments = dict()
         self.displays = dict()
         self.programfile_content = ''
-        self.programfile_line_map = dict()
 
     @property
     def functions(self):
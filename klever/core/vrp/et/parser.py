@@ -15,6 +15,8 @@
 # limitations under the License.
 #
 
+import array
+import bisect
 import os
 import re
 import xml.etree.ElementTree as ET
@@ -24,6 +26,14 @@ from klever.core.vrp.et.error_trace import ErrorTrace
 
 class ErrorTraceParser:
     WITNESS_NS = {'graphml': 'http://graphml.graphdrawing.org/xmlns'}
+    GRAPH_TAG = '{http://graphml.graphdrawing.org/xmlns}graph'
+    DATA_TAG = '{http://graphml.graphdrawing.org/xmlns}data'
+    NODE_TAG = '{http://graphml.graphdrawing.org/xmlns}node'
+    EDGE_TAG = '{http://graphml.graphdrawing.org/xmlns}edge'
+    LINE_DIRECTIVE = re.compile(r'#line\s+(\d+)\s*(.*)')
+    # Special identifiers for program file lines that have no references to original source files.
+    NO_FILE_ID = -2
+    UNKNOWN_FILE_ID = -1
 
     def __init__(self, logger, witness, verification_task_files):
         self._logger = logger
@@ -53,76 +63,60 @@ class ErrorTraceParser:
     def _parse_witness(self, witness):
         self._logger.info('Parse witness {!r}'.format(witness))
 
+        self._sink_nodes_map = dict()
+        self._parsed_node_ids = set()
+        self._unsupported_node_data_keys = dict()
+        self._unsupported_edge_data_keys = dict()
+        self._nodes_num = 0
+        # The number of edges leading to sink nodes. Such edges will be completely removed.
+        self._sink_edges_num = 0
+        self._edges_num = 0
+        self._edges_to_remove = []
+        self._referred_file_ids = set()
+        # Offsets of beginnings of program file lines and references to original source files for these lines.
+        self._programfile_line_offsets = None
+        self._programfile_line_file_ids = None
+        self._programfile_line_nums = None
+
+        # Witnesses can be very large, so they are parsed incrementally and elements are dropped as soon as they are
+        # processed. Edges are processed when their nodes and the program file are already known. Otherwise they are
+        # postponed until the end of the witness together with all subsequent edges to keep their order.
+        postponed_edges = []
+        graph = None
+        depth = 0
         with open(witness, encoding='utf8') as fp:
-            tree = ET.parse(fp)
-
-        root = tree.getroot()
-
-        graph = root.find('graphml:graph', self.WITNESS_NS)
-
-        self.__parse_witness_data(graph)
-        sink_nodes_map = self.__parse_witness_nodes(graph)
-        self.__parse_witness_edges(graph, sink_nodes_map)
-
-    def __parse_witness_data(self, graph):
-        for data in graph.findall('graphml:data', self.WITNESS_NS):
-            if 'klever-attrs' in data.attrib and data.attrib['klever-attrs'] == 'true':
-                self.error_trace.add_attr(data.attrib['key'], data.text,
-                                          True if data.attrib['associate'] == 'true' else False,
-                                          True if data.attrib['compare'] == 'true' else False)
-
-            # TODO: at the moment violation witnesses do not support multiple program files.
-            if data.attrib['key'] == 'programfile':
-                with open(self.verification_task_files[os.path.normpath(data.text)]) as fp:
-                    line_num = 1
-                    orig_file_id = None
-                    orig_file_line_num = 0
-                    for line in fp:
-                        self.error_trace.programfile_content += line
-                        m = re.match(r'#line\s+(\d+)\s*(.*)', line)
-                        if m:
-                            orig_file_line_num = int(m.group(1))
-                            if m.group(2):
-                                file_name = m.group(2)[1:-1]
-                                # Do not treat artificial file references. Let's hope that they will disappear one day.
-                                if not os.path.basename(file_name) == '<built-in>':
-                                    orig_file_id = self.error_trace.add_file(file_name)
-                        else:
-                            self.error_trace.programfile_line_map[line_num] = (orig_file_id, orig_file_line_num)
-                            orig_file_line_num += 1
-                        line_num += 1
-
-    def __parse_witness_nodes(self, graph):
-        sink_nodes_map = dict()
-        unsupported_node_data_keys = dict()
-        nodes_number = 0
-
-        for node in graph.findall('graphml:node', self.WITNESS_NS):
-            is_sink = False
-
-            for data in node.findall('graphml:data', self.WITNESS_NS):
-                data_key = data.attrib['key']
-                if data_key == 'entry':
-                    self.error_trace.add_entry_node_id(node.attrib['id'])
-                    self._logger.debug('Parse entry node {!r}'.format(node.attrib['id']))
-                elif data_key == 'sink':
-                    is_sink = True
-                    self._logger.debug('Parse sink node {!r}'.format(node.attrib['id']))
-                elif data_key == 'violation':
-                    if len(list(self.error_trace.violation_nodes)) > 0:
-                        raise NotImplementedError('Several violation nodes are not supported')
-                    self.error_trace.add_violation_node_id(node.attrib['id'])
-                    self._logger.debug('Parse violation node {!r}'.format(node.attrib['id']))
-                elif data_key not in unsupported_node_data_keys:
-                    self._logger.warning('Node data key {!r} is not supported'.format(data_key))
-                    unsupported_node_data_keys[data_key] = None
-
-            # Do not track sink nodes as all other nodes. All edges leading to sink nodes will be excluded as well.
-            if is_sink:
-                sink_nodes_map[node.attrib['id']] = None
-            else:
-                nodes_number += 1
-                self.error_trace.add_node(node.attrib['id'])
+            for event, elem in ET.iterparse(fp, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if depth == 2 and elem.tag == self.GRAPH_TAG:
+                        graph = elem
+                    continue
+
+                depth -= 1
+                # Treat only direct children of the graph.
+                if depth != 2 or graph is None:
+                    continue
+
+                if elem.tag == self.DATA_TAG:
+                    self.__parse_witness_data(elem)
+                elif elem.tag == self.NODE_TAG:
+                    self.__parse_witness_node(elem)
+                elif elem.tag == self.EDGE_TAG:
+                    # Sanity checks.
+                    if 'source' not in elem.attrib:
+                        raise KeyError('Source node was not found')
+                    if 'target' not in elem.attrib:
+                        raise KeyError('Destination node was not found')
+
+                    edge = (elem.attrib['source'], elem.attrib['target'],
+                            [(data.attrib['key'], data.text) for data in elem.findall('graphml:data', self.WITNESS_NS)])
+                    if not postponed_edges and self._programfile_line_offsets is not None and \
+                            edge[0] in self._parsed_node_ids and edge[1] in self._parsed_node_ids:
+                        self.__parse_witness_edge(*edge)
+                    else:
+                        postponed_edges.append(edge)
+
+                graph.clear()
 
         # Sanity checks.
         if not self.error_trace.entry_node:
@@ -130,113 +124,175 @@ class ErrorTraceParser:
         if len(list(self.error_trace.violation_nodes)) == 0:
             raise KeyError('Violation nodes were not found')
 
-        self._logger.debug('Parse {0} nodes and {1} sink nodes'.format(nodes_number, len(sink_nodes_map)))
-        return sink_nodes_map
+        self._logger.debug('Parse {0} nodes and {1} sink nodes'.format(self._nodes_num, len(self._sink_nodes_map)))
 
-    def __parse_witness_edges(self, graph, sink_nodes_map):
-        unsupported_edge_data_keys = dict()
+        for edge in postponed_edges:
+            self.__parse_witness_edge(*edge)
 
-        # Use maps for source files and functions as for nodes. Add artificial map to 0 for default file without
-        # explicitly specifying its path.
-        # The number of edges leading to sink nodes. Such edges will be completely removed.
-        sink_edges_num = 0
-        edges_num = 0
-
-        edges_to_remove = []
-        referred_file_ids = set()
-        for edge in graph.findall('graphml:edge', self.WITNESS_NS):
-            # Sanity checks.
-            if 'source' not in edge.attrib:
-                raise KeyError('Source node was not found')
-            if 'target' not in edge.attrib:
-                raise KeyError('Destination node was not found')
-
-            source_node_id = edge.attrib['source']
-
-            if edge.attrib['target'] in sink_nodes_map:
-                sink_edges_num += 1
-                continue
-
-            target_node_id = edge.attrib['target']
-
-            # Update lists of input and output edges for source and target nodes.
-            _edge = self.error_trace.add_edge(source_node_id, target_node_id)
-
-            startoffset = None
-            endoffset = None
-            control = None
-            for data in edge.findall('graphml:data', self.WITNESS_NS):
-                data_key = data.attrib['key']
-                if data_key == 'startoffset':
-                    startoffset = int(data.text)
-                elif data_key == 'endoffset':
-                    endoffset = int(data.text)
-                elif data_key == 'enterFunction' or data_key == 'returnFrom' or data_key == 'assumption.scope':
-                    self.error_trace.add_function(data.text)
-                    if data_key == 'enterFunction':
-                        _edge['enter'] = self.error_trace.resolve_function_id(data.text)
-                        # Frama-C (CIL) can add artificial suffixes "_\d+" for functions with the same name during
-                        # merge to avoid conflicts during subsequent name resolution. Remember references to original
-                        # function names that can be useful later, e.g. when adding displays for instrumenting
-                        # functions.
-                        m = re.search(r'(.+)(_\d+)$', data.text)
-                        if m:
-                            unmerged_func_name = m.group(1)
-                            self.error_trace.add_function(unmerged_func_name)
-                            _edge['unmerged enter'] = self.error_trace.resolve_function_id(unmerged_func_name)
-                    elif data_key == 'returnFrom':
-                        _edge['return'] = self.error_trace.resolve_function_id(data.text)
-                    else:
-                        _edge['assumption scope'] = self.error_trace.resolve_function_id(data.text)
-                elif data_key == 'control':
-                    control = True if data.text == 'condition-true' else False
-                    _edge['condition'] = True
-                elif data_key == 'assumption':
-                    _edge['assumption'] = data.text
-                elif data_key == 'threadId':
-                    # TODO: SV-COMP states that thread identifiers should unique, they may be non-numbers as we want.
-                    _edge['thread'] = int(data.text)
-                elif data_key in ('note', 'warning'):
-                    _edge[data_key if data_key == 'note' else 'warn'] = data.text
-                elif data_key not in unsupported_edge_data_keys:
-                    self._logger.warning('Edge data key {!r} is not supported'.format(data_key))
-                    unsupported_edge_data_keys[data_key] = None
-
-            if startoffset and endoffset:
-                _edge['source'] = self.error_trace.programfile_content[startoffset:(endoffset + 1)]
-
-                # Calculate the number of lines up to start offset. It is key within line map hash.
-                lines_num = len(re.findall(r'\n', self.error_trace.programfile_content[:startoffset])) + 1
-                _edge['file'], _edge['line'] = self.error_trace.programfile_line_map[lines_num]
-                referred_file_ids.add(_edge['file'])
-
-                if control is not None:
-                    # Replace conditions to negative ones to consider else branches.
-                    if not control:
-                        cond_replaces = {'==': '!=', '!=': '==', '<=': '>', '>=': '<', '<': '>=', '>': '<='}
-                        for orig_cond, replace_cond in cond_replaces.items():
-                            m = re.match(r'^(.+){0}(.+)$'.format(orig_cond), _edge['source'])
-                            if m:
-                                _edge['source'] = '{0}{1}{2}'.format(m.group(1), replace_cond, m.group(2))
-                                # Do not proceed after some replacement is applied - others won't be done.
-                                break
-
-                    control = None
-                else:
-                    # End all statements with ";" like in C.
-                    if _edge['source'][-1] != ';':
-                        _edge['source'] += ';'
-            # TODO: workaround! Here VRP should fail since violation witnesses format is not valid.
-            else:
-                self._logger.warning('Edge from {0} to {1} does not have start or/and end offsets'
-                                     .format(source_node_id, target_node_id))
-                edges_to_remove.append(_edge)
-
-            edges_num += 1
-
-        for edge_to_remove in edges_to_remove:
+        for edge_to_remove in self._edges_to_remove:
             self.error_trace.remove_edge_and_target_node(edge_to_remove)
 
-        self.error_trace.remove_unreffered_files(referred_file_ids)
-
-        self._logger.debug('Parse {0} edges and {1} sink edges'.format(edges_num, sink_edges_num))
+        self.error_trace.remove_unreffered_files(self._referred_file_ids)
+
+        self._logger.debug('Parse {0} edges and {1} sink edges'.format(self._edges_num, self._sink_edges_num))
+
+    def __parse_witness_data(self, data):
+        if 'klever-attrs' in data.attrib and data.attrib['klever-attrs'] == 'true':
+            self.error_trace.add_attr(data.attrib['key'], data.text,
+                                      True if data.attrib['associate'] == 'true' else False,
+                                      True if data.attrib['compare'] == 'true' else False)
+
+        # TODO: at the moment violation witnesses do not support multiple program files.
+        if data.attrib['key'] == 'programfile':
+            self.__parse_programfile(self.verification_task_files[os.path.normpath(data.text)])
+
+    def __parse_programfile(self, programfile):
+        # Lines are joined just once at the end since repeated concatenation of strings is too expensive for large
+        # program files. Line map is stored within arrays for the same reason.
+        lines = []
+        line_offsets = array.array('q')
+        line_file_ids = array.array('i')
+        line_nums = array.array('q')
+        offset = 0
+        orig_file_id = None
+        orig_file_line_num = 0
+        with open(programfile) as fp:
+            for line in fp:
+                lines.append(line)
+                line_offsets.append(offset)
+                offset += len(line)
+
+                m = self.LINE_DIRECTIVE.match(line) if line.startswith('#line') else None
+                if m:
+                    orig_file_line_num = int(m.group(1))
+                    if m.group(2):
+                        file_name = m.group(2)[1:-1]
+                        # Do not treat artificial file references. Let's hope that they will disappear one day.
+                        if not os.path.basename(file_name) == '<built-in>':
+                            orig_file_id = self.error_trace.add_file(file_name)
+                    # Lines with directives do not correspond to any line of original source files.
+                    line_file_ids.append(self.NO_FILE_ID)
+                    line_nums.append(-1)
+                else:
+                    line_file_ids.append(self.UNKNOWN_FILE_ID if orig_file_id is None else orig_file_id)
+                    line_nums.append(orig_file_line_num)
+                    orig_file_line_num += 1
+
+        self.error_trace.programfile_content = ''.join(lines)
+        self._programfile_line_offsets = line_offsets
+        self._programfile_line_file_ids = line_file_ids
+        self._programfile_line_nums = line_nums
+
+    def __get_programfile_line(self, offset):
+        # Calculate the number of lines up to start offset.
+        if self._programfile_line_offsets is None:
+            raise KeyError('Program file was not specified')
+        line_idx = bisect.bisect_right(self._programfile_line_offsets, offset) - 1
+        if line_idx < 0 or self._programfile_line_file_ids[line_idx] == self.NO_FILE_ID:
+            raise KeyError(line_idx + 1)
+
+        file_id = self._programfile_line_file_ids[line_idx]
+        return None if file_id == self.UNKNOWN_FILE_ID else file_id, self._programfile_line_nums[line_idx]
+
+    def __parse_witness_node(self, node):
+        is_sink = False
+
+        for data in node.findall('graphml:data', self.WITNESS_NS):
+            data_key = data.attrib['key']
+            if data_key == 'entry':
+                self.error_trace.add_entry_node_id(node.attrib['id'])
+                self._logger.debug('Parse entry node {!r}'.format(node.attrib['id']))
+            elif data_key == 'sink':
+                is_sink = True
+                self._logger.debug('Parse sink node {!r}'.format(node.attrib['id']))
+            elif data_key == 'violation':
+                if len(list(self.error_trace.violation_nodes)) > 0:
+                    raise NotImplementedError('Several violation nodes are not supported')
+                self.error_trace.add_violation_node_id(node.attrib['id'])
+                self._logger.debug('Parse violation node {!r}'.format(node.attrib['id']))
+            elif data_key not in self._unsupported_node_data_keys:
+                self._logger.warning('Node data key {!r} is not supported'.format(data_key))
+                self._unsupported_node_data_keys[data_key] = None
+
+        # Do not track sink nodes as all other nodes. All edges leading to sink nodes will be excluded as well.
+        if is_sink:
+            self._sink_nodes_map[node.attrib['id']] = None
+        else:
+            self._nodes_num += 1
+            self.error_trace.add_node(node.attrib['id'])
+        self._parsed_node_ids.add(node.attrib['id'])
+
+    def __parse_witness_edge(self, source_node_id, target_node_id, edge_data):
+        if target_node_id in self._sink_nodes_map:
+            self._sink_edges_num += 1
+            return
+
+        # Update lists of input and output edges for source and target nodes.
+        _edge = self.error_trace.add_edge(source_node_id, target_node_id)
+
+        startoffset = None
+        endoffset = None
+        control = None
+        for data_key, data_text in edge_data:
+            if data_key == 'startoffset':
+                startoffset = int(data_text)
+            elif data_key == 'endoffset':
+                endoffset = int(data_text)
+            elif data_key == 'enterFunction' or data_key == 'returnFrom' or data_key == 'assumption.scope':
+                self.error_trace.add_function(data_text)
+                if data_key == 'enterFunction':
+                    _edge['enter'] = self.error_trace.resolve_function_id(data_text)
+                    # Frama-C (CIL) can add artificial suffixes "_\d+" for functions with the same name during
+                    # merge to avoid conflicts during subsequent name resolution. Remember references to original
+                    # function names that can be useful later, e.g. when adding displays for instrumenting
+                    # functions.
+                    m = re.search(r'(.+)(_\d+)$', data_text)
+                    if m:
+                        unmerged_func_name = m.group(1)
+                        self.error_trace.add_function(unmerged_func_name)
+                        _edge['unmerged enter'] = self.error_trace.resolve_function_id(unmerged_func_name)
+                elif data_key == 'returnFrom':
+                    _edge['return'] = self.error_trace.resolve_function_id(data_text)
+                else:
+                    _edge['assumption scope'] = self.error_trace.resolve_function_id(data_text)
+            elif data_key == 'control':
+                control = True if data_text == 'condition-true' else False
+                _edge['condition'] = True
+            elif data_key == 'assumption':
+                _edge['assumption'] = data_text
+            elif data_key == 'threadId':
+                # TODO: SV-COMP states that thread identifiers should unique, they may be non-numbers as we want.
+                _edge['thread'] = int(data_text)
+            elif data_key in ('note', 'warning'):
+                _edge[data_key if data_key == 'note' else 'warn'] = data_text
+            elif data_key not in self._unsupported_edge_data_keys:
+                self._logger.warning('Edge data key {!r} is not supported'.format(data_key))
+                self._unsupported_edge_data_keys[data_key] = None
+
+        if startoffset and endoffset:
+            _edge['source'] = self.error_trace.programfile_content[startoffset:(endoffset + 1)]
+
+            _edge['file'], _edge['line'] = self.__get_programfile_line(startoffset)
+            self._referred_file_ids.add(_edge['file'])
+
+            if control is not None:
+                # Replace conditions to negative ones to consider else branches.
+                if not control:
+                    cond_replaces = {'==': '!=', '!=': '==', '<=': '>', '>=': '<', '<': '>=', '>': '<='}
+                    for orig_cond, replace_cond in cond_replaces.items():
+                        m = re.match(r'^(.+){0}(.+)$'.format(orig_cond), _edge['source'])
+                        if m:
+                            _edge['source'] = '{0}{1}{2}'.format(m.group(1), replace_cond, m.group(2))
+                            # Do not proceed after some replacement is applied - others won't be done.
+                            break
+            else:
+                # End all statements with ";" like in C.
+                if _edge['source'][-1] != ';':
+                    _edge['source'] += ';'
+        # TODO: workaround! Here VRP should fail since violation witnesses format is not valid.
+        else:
+            self._logger.warning('Edge from {0} to {1} does not have start or/and end offsets'
+                                 .format(source_node_id, target_node_id))
+            self._edges_to_remove.append(_edge)
+
+        self._edges_num += 1
@@ -0,0 +1,122 @@
+#
+# Copyright (c) 2019 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import logging
+
+import pytest
+
+from klever.core.vrp.et.parser import ErrorTraceParser
+
+
+PROGRAMFILE = '''#line 1 "{0}"
+int g(void) {{
+  return 0;
+}}
+int h(void) {{
+  return 1;
+}}
+int main(void) {{
+  g();
+  h();
+  return 0;
+}}
+'''
+
+DATA = '''<data key="programfile">cil.i</data>
+'''
+
+NODES = {
+    'A': '<node id="A"><data key="entry">true</data></node>',
+    'B': '<node id="B"/>',
+    'C': '<node id="C"/>',
+    'D': '<node id="D"/>',
+    'E': '<node id="E"><data key="violation">true</data></node>',
+    'S': '<node id="S"><data key="sink">true</data></node>'
+}
+
+EDGES = {
+    'AB': '<edge source="A" target="B"><data key="enterFunction">main</data>'
+          '<data key="startoffset">{0}</data><data key="endoffset">{1}</data></edge>',
+    'BC': '<edge source="B" target="C"><data key="enterFunction">g</data>'
+          '<data key="startoffset">{2}</data><data key="endoffset">{3}</data></edge>',
+    'CD': '<edge source="C" target="D"><data key="returnFrom">g</data>'
+          '<data key="startoffset">{4}</data><data key="endoffset">{5}</data></edge>',
+    'BS': '<edge source="B" target="S"><data key="startoffset">{2}</data><data key="endoffset">{3}</data></edge>',
+    'DE': '<edge source="D" target="E"><data key="enterFunction">h</data>'
+          '<data key="startoffset">{6}</data><data key="endoffset">{7}</data></edge>'
+}
+
+# Witness layouts. The first one is the usual one while in other ones nodes and edges are interleaved.
+LAYOUTS = [
+    ['data', 'A', 'B', 'C', 'D', 'E', 'S', 'AB', 'BC', 'BS', 'CD', 'DE'],
+    ['A', 'B', 'AB', 'BC', 'C', 'S', 'BS', 'D', 'E', 'CD', 'DE', 'data'],
+    ['data', 'A', 'B', 'AB', 'BC', 'C', 'D', 'E', 'DE', 'CD', 'S', 'BS']
+]
+
+
+@pytest.fixture
+def task_files(tmpdir):
+    src = tmpdir.join('main.c')
+    src.write('')
+    programfile_content = PROGRAMFILE.format(str(src))
+    programfile = tmpdir.join('cil.i')
+    programfile.write(programfile_content)
+
+    # Edges refer statements calling functions and returning from them.
+    offsets = []
+    for stmt in ('main(void)', 'g();', 'return 0;', 'h();'):
+        offset = programfile_content.index(stmt)
+        offsets.extend([offset, offset + len(stmt) - 1])
+
+    return tmpdir, str(src), {'cil.i': str(programfile)}, offsets
+
+
+def parse(tmpdir, task_files, offsets, layout):
+    elements = [DATA if element == 'data' else NODES.get(element) or EDGES[element].format(*offsets)
+                for element in layout]
+    witness = tmpdir.join('witness.graphml')
+    witness.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                  '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                  '<key attr.name="programfile" attr.type="string" for="graph" id="programfile"/>\n'
+                  '<graph edgedefault="directed">\n{0}\n</graph>\n</graphml>\n'.format('\n'.join(elements)))
+
+    return ErrorTraceParser(logging.getLogger('test'), str(witness), task_files).error_trace
+
+
+def describe(error_trace):
+    funcs = [name for _, name in error_trace.functions]
+    files = [name for _, name in error_trace.files]
+    edges = [(edge['file'], edge['line'], edge['source'], edge.get('enter'), edge.get('return'))
+             for edge in error_trace.trace_iterator()]
+    return funcs, files, edges
+
+
+def test_witness_layouts(task_files):
+    tmpdir, src, files, offsets = task_files
+    expected = (
+        ['main', 'g', 'h'],
+        [src],
+        [
+            (0, 7, 'main(void);', 0, None),
+            (0, 8, 'g();', 1, None),
+            (0, 2, 'return 0;', None, 1),
+            (0, 9, 'h();', 2, None)
+        ]
+    )
+
+    for layout in LAYOUTS:
+        assert describe(parse(tmpdir, files, offsets, layout)) == expected
@@ -22,7 +22,6 @@ import os
 import re
 import copy
 import hashlib
-import time
 
 import klever.core.components
 import klever.core.utils
@@ -357,6 +356,9 @@ class VTG(klever.core.components.Component):
 
         max_tasks = int(self.conf['max solving tasks per sub-job'])
         active_tasks = 0
+        events_queues = [self.mqs['prepared verification tasks'], self.mqs['processed tasks']]
+        if not self.conf['keep intermediate files']:
+            events_queues.append(self.mqs['delete dir'])
         while True:
             # Fetch pilot statuses
             pilot_statuses = []
@@ -513,7 +515,9 @@ class VTG(klever.core.components.Component):
                 self.logger.debug("There are {} initial tasks to be generated, {} active tasks, {} program fragment "
                                   "descriptions".format(len(initial), active_tasks, len(pf_descriptions)))
 
-            time.sleep(3)
+            # React to prepared and solved tasks immediately. Nevertheless, check statuses from time to time since the
+            # balancer decides on rescheduling taking into account the remaining wall time.
+            klever.core.utils.wait_for_queues(events_queues, 3)
 
         self.logger.info("Stop generating verification tasks")
 
@@ -644,6 +648,10 @@ class VTGW(klever.core.components.Component):
         # Invoke all plugins one by one.
         cur_abstract_task_desc_file = initial_abstract_task_desc_file
         out_abstract_task_desc_file = None
+        # Plugins can be run within this process one after another passing abstract verification task descriptions in
+        # memory. This considerably reduces overheads for small verification tasks.
+        in_process = self.conf.get('run plugins in process', False)
+        cur_abstract_task_desc = initial_abstract_task_desc if in_process else None
         if self.rerun:
             # Get only the last, and note that the last one prepares tasks and otherwise rerun should not be set
             plugins = [req_spec_desc['plugins'][-1]]
@@ -660,6 +668,7 @@ class VTGW(klever.core.components.Component):
                 cur_abstract_task_desc_file = os.path.join(os.pardir, out_abstract_task_desc_file)
                 os.symlink(os.path.relpath(cur_abstract_task_desc_file, os.path.curdir),
                            out_abstract_task_desc_file)
+                cur_abstract_task_desc = None
 
             if self.req_spec_id not in [c[0]['identifier'] for c in self.req_spec_classes.values()] and \
                     plugin_desc['name'] in ['SA', 'EMG']:
@@ -674,6 +683,7 @@ class VTGW(klever.core.components.Component):
                 os.symlink(os.path.relpath(pilot_abstract_task_desc_file, os.path.curdir),
                            out_abstract_task_desc_file)
                 os.symlink(os.path.relpath(pilot_plugin_work_dir, os.path.curdir), plugin_work_dir)
+                cur_abstract_task_desc = None
             else:
                 self.logger.info('Launch plugin {0}'.format(plugin_desc['name']))
 
@@ -692,12 +702,13 @@ class VTGW(klever.core.components.Component):
                 plugin_conf['solution class'] = self.req_spec_id
                 plugin_conf['override resource limits'] = self.override_limits
 
-                plugin_conf_file = '{0} conf.json'.format(plugin_desc['name'].lower())
-                self.logger.debug(
-                    'Put configuration of plugin "{0}" to file "{1}"'.format(plugin_desc['name'],
-                                                                             plugin_conf_file))
-                with open(plugin_conf_file, 'w', encoding='utf8') as fp:
-                    klever.core.utils.json_dump(plugin_conf, fp, self.conf['keep intermediate files'])
+                if not in_process or self.conf['keep intermediate files']:
+                    plugin_conf_file = '{0} conf.json'.format(plugin_desc['name'].lower())
+                    self.logger.debug(
+                        'Put configuration of plugin "{0}" to file "{1}"'.format(plugin_desc['name'],
+                                                                                 plugin_conf_file))
+                    with open(plugin_conf_file, 'w', encoding='utf8') as fp:
+                        klever.core.utils.json_dump(plugin_conf, fp, self.conf['keep intermediate files'])
 
                 try:
                     plugin = getattr(importlib.import_module(
@@ -706,8 +717,16 @@ class VTGW(klever.core.components.Component):
                     p = plugin(plugin_conf, self.logger, self.id, self.callbacks, self.mqs, self.vals,
                                plugin_desc['name'], plugin_work_dir, separate_from_parent=True,
                                include_child_resources=True)
-                    p.start()
-                    p.join()
+                    if in_process:
+                        p.abstract_task_desc = cur_abstract_task_desc
+                        # Other verification tasks and reruns use descriptions prepared by SA, EMG and the last plugin.
+                        p.dump_abstract_task_desc = self.conf['keep intermediate files'] or \
+                            plugin_desc['name'] in ('SA', 'EMG') or plugin_desc is plugins[-1]
+                        self.launch_in_process(p)
+                        cur_abstract_task_desc = p.abstract_task_desc
+                    else:
+                        p.start()
+                        p.join()
                 except klever.core.components.ComponentError:
                     self.plugin_fail_processing()
                     break
@@ -737,8 +756,11 @@ class VTGW(klever.core.components.Component):
                os.path.isfile(os.path.join(plugin_work_dir, 'task files.zip')):
                 task_id = self.session.schedule_task(os.path.join(plugin_work_dir, 'task.json'),
                                                      os.path.join(plugin_work_dir, 'task files.zip'))
-                with open(self.abstract_task_desc_file, 'r', encoding='utf8') as fp:
-                    final_task_data = json.load(fp)
+                if cur_abstract_task_desc is not None:
+                    final_task_data = cur_abstract_task_desc
+                else:
+                    with open(self.abstract_task_desc_file, 'r', encoding='utf8') as fp:
+                        final_task_data = json.load(fp)
 
                 # Plan for checking status
                 self.mqs['pending tasks'].put([
@@ -17,9 +17,9 @@
 
 import fileinput
 import os
-from clade import Clade
 
 import klever.core.utils
+import klever.core.clade_service
 import klever.core.vtg.plugins
 import klever.core.vtg.utils
 
@@ -69,7 +69,7 @@ class ASE(klever.core.vtg.plugins.Plugin):
     def request_arg_signs(self):
         self.logger.info('Request argument signatures')
 
-        clade = Clade(work_dir=self.conf['build base'])
+        clade = klever.core.clade_service.get_clade(self.logger, self.conf)
         if not clade.work_dir_ok():
             raise RuntimeError('Build base is not OK')
         meta = clade.get_meta()
@@ -19,8 +19,8 @@ import os
 import re
 import ujson
 import sortedcontainers
-from clade import Clade
 
+from klever.core.clade_service import get_clade
 from klever.core.vtg.emg.common.c import Function, Variable, Macro, import_declaration
 from klever.core.vtg.emg.common.c.types import import_typedefs, extract_name
 from klever.core.vtg.utils import find_file_or_dir
@@ -36,7 +36,7 @@ def create_source_representation(logger, conf, abstract_task):
     :return: Source object.
     """
     # Initialize Clade cient to make requests
-    clade = Clade(conf['build base'])
+    clade = get_clade(logger, conf)
     if not clade.work_dir_ok():
         raise RuntimeError('Build base is not OK')
 
@@ -15,7 +15,7 @@
 # limitations under the License.
 #
 
-from klever.core.vtg.emg.common.c.types import import_declaration
+from klever.core.vtg.emg.common.c.types import import_declaration, parse_declaration, reduce_level
 
 
 def parser_test(method):
@@ -49,6 +49,16 @@ def test_equality():
         assert obj.to_string('x') == test
 
 
+def test_memoized_parsing():
+    ast = parse_declaration('int **a')
+    reduce_level(ast)
+    ast['specifiers'] = None
+
+    # Modifications of obtained abstract syntax trees should not affect next parsing results
+    assert parse_declaration('int **a') != ast
+    assert import_declaration('int **a').to_string('a') == 'int **a'
+
+
 @parser_test
 def test_var():
     return [
@@ -16,6 +16,8 @@
 #
 
 import re
+import copy
+import functools
 import sortedcontainers
 import ply.lex as lex
 import ply.yacc as yacc
@@ -788,7 +790,9 @@ def setup_parser():
     global __lexer
 
     __lexer = lex.lex()
-    __parser = yacc.yacc(debug=0, write_tables=0)
+    # Parsing tables are generated in advance and kept in module declaration_parsetab. If the grammar is changed, PLY
+    # will regenerate tables in memory, so do not forget to update that module.
+    __parser = yacc.yacc(debug=0, write_tables=0, tabmodule='declaration_parsetab')
 
 
 def parse_declaration(string):
@@ -798,6 +802,12 @@ def parse_declaration(string):
     :param string: C declaration string.
     :return: Obtained abstract syntax tree.
     """
+    # The same declarations are parsed many times, but callers can modify obtained abstract syntax trees.
+    return copy.deepcopy(_parse_declaration(string))
+
+
+@functools.lru_cache(maxsize=10000)
+def _parse_declaration(string):
     global __parser
     global __lexer
 
@@ -285,7 +285,9 @@ def setup_parser():
     global __lexer
 
     __lexer = lex.lex()
-    __parser = yacc.yacc(debug=0, write_tables=0)
+    # Parsing tables are generated in advance and kept in module process_parsetab. If the grammar is changed, PLY will
+    # regenerate tables in memory, so do not forget to update that module.
+    __parser = yacc.yacc(debug=0, write_tables=0, tabmodule='process_parsetab')
 
 
 def parse_process(process, string):
@@ -0,0 +1,57 @@
+
+# process_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'BR_CLOSE BR_OPEN BS DIM_CLOSE DIM_OPEN DOT IDENTIFIER NUMBER PAR_CLOSE PAR_OPEN PER RS SBR_CLOSE SBR_OPEN SEP\n    process : action_list\n    \n    action_list : concatenation_list\n                | choice_list\n    \n    action : dispatch\n           | receive\n           | subprocess\n           | condition\n           | bracket\n    \n    concatenation_list : action DOT concatenation_list\n                       | action\n    \n    choice_list : concatenation_list SEP choice_list\n                | concatenation_list\n    \n    bracket : PAR_OPEN action_list PAR_CLOSE\n    \n    repeate : SBR_OPEN NUMBER SBR_CLOSE\n            | SBR_OPEN PER IDENTIFIER PER SBR_CLOSE\n    \n    dispatch : SBR_OPEN BS IDENTIFIER repeate SBR_CLOSE\n             | SBR_OPEN IDENTIFIER repeate SBR_CLOSE\n             | SBR_OPEN BS IDENTIFIER SBR_CLOSE\n             | SBR_OPEN IDENTIFIER SBR_CLOSE\n    \n    receive : PAR_OPEN RS IDENTIFIER repeate PAR_CLOSE\n            | PAR_OPEN IDENTIFIER repeate PAR_CLOSE\n            | PAR_OPEN RS IDENTIFIER PAR_CLOSE\n            | PAR_OPEN IDENTIFIER PAR_CLOSE\n    \n    condition : DIM_OPEN IDENTIFIER repeate DIM_CLOSE\n              | DIM_OPEN IDENTIFIER DIM_CLOSE\n    \n    subprocess : BR_OPEN IDENTIFIER repeate BR_CLOSE\n               | BR_OPEN IDENTIFIER BR_CLOSE\n    '
+    
+_lr_action_items = {'SBR_OPEN':([0,12,15,16,18,20,22,23,27,31,],[11,11,11,11,28,28,28,28,28,28,]),'PAR_OPEN':([0,12,15,16,],[12,12,12,12,]),'BR_OPEN':([0,12,15,16,],[13,13,13,13,]),'DIM_OPEN':([0,12,15,16,],[14,14,14,14,]),'$end':([1,2,3,4,5,6,7,8,9,10,24,25,26,30,33,34,36,38,40,43,45,46,47,48,49,52,],[0,-1,-2,-3,-10,-4,-5,-6,-7,-8,-12,-11,-9,-19,-23,-13,-27,-25,-18,-17,-22,-21,-26,-24,-16,-20,]),'PAR_CLOSE':([3,4,5,6,7,8,9,10,20,21,24,25,26,30,31,32,33,34,36,38,40,43,44,45,46,47,48,49,50,52,54,],[-2,-3,-10,-4,-5,-6,-7,-8,33,34,-12,-11,-9,-19,45,46,-23,-13,-27,-25,-18,-17,52,-22,-21,-26,-24,-16,-14,-20,-15,]),'SEP':([3,5,6,7,8,9,10,24,26,30,33,34,36,38,40,43,45,46,47,48,49,52,],[15,-10,-4,-5,-6,-7,-8,15,-9,-19,-23,-13,-27,-25,-18,-17,-22,-21,-26,-24,-16,-20,]),'DOT':([5,6,7,8,9,10,30,33,34,36,38,40,43,45,46,47,48,49,52,],[16,-4,-5,-6,-7,-8,-19,-23,-13,-27,-25,-18,-17,-22,-21,-26,-24,-16,-20,]),'BS':([11,],[17,]),'IDENTIFIER':([11,12,13,14,17,19,42,],[18,20,22,23,27,31,51,]),'RS':([12,],[19,]),'SBR_CLOSE':([18,27,29,39,41,50,53,54,],[30,40,43,49,50,-14,54,-15,]),'BR_CLOSE':([22,35,50,54,],[36,47,-14,-15,]),'DIM_CLOSE':([23,37,50,54,],[38,48,-14,-15,]),'NUMBER':([28,],[41,]),'PER':([28,51,],[42,53,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'process':([0,],[1,]),'action_list':([0,12,],[2,21,]),'concatenation_list':([0,12,15,16,],[3,3,24,26,]),'choice_list':([0,12,15,],[4,4,25,]),'action':([0,12,15,16,],[5,5,5,5,]),'dispatch':([0,12,15,16,],[6,6,6,6,]),'receive':([0,12,15,16,],[7,7,7,7,]),'subprocess':([0,12,15,16,],[8,8,8,8,]),'condition':([0,12,15,16,],[9,9,9,9,]),'bracket':([0,12,15,16,],[10,10,10,10,]),'repeate':([18,20,22,23,27,31,],[29,32,35,37,39,44,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> process","S'",1,None,None,None),
+  ('process -> action_list','process',1,'p_process','parser.py',108),
+  ('action_list -> concatenation_list','action_list',1,'p_action_list','parser.py',116),
+  ('action_list -> choice_list','action_list',1,'p_action_list','parser.py',117),
+  ('action -> dispatch','action',1,'p_action','parser.py',125),
+  ('action -> receive','action',1,'p_action','parser.py',126),
+  ('action -> subprocess','action',1,'p_action','parser.py',127),
+  ('action -> condition','action',1,'p_action','parser.py',128),
+  ('action -> bracket','action',1,'p_action','parser.py',129),
+  ('concatenation_list -> action DOT concatenation_list','concatenation_list',3,'p_concatenation_list','parser.py',137),
+  ('concatenation_list -> action','concatenation_list',1,'p_concatenation_list','parser.py',138),
+  ('choice_list -> concatenation_list SEP choice_list','choice_list',3,'p_choice_list','parser.py',156),
+  ('choice_list -> concatenation_list','choice_list',1,'p_choice_list','parser.py',157),
+  ('bracket -> PAR_OPEN action_list PAR_CLOSE','bracket',3,'p_bracket','parser.py',175),
+  ('repeate -> SBR_OPEN NUMBER SBR_CLOSE','repeate',3,'p_repeate','parser.py',188),
+  ('repeate -> SBR_OPEN PER IDENTIFIER PER SBR_CLOSE','repeate',5,'p_repeate','parser.py',189),
+  ('dispatch -> SBR_OPEN BS IDENTIFIER repeate SBR_CLOSE','dispatch',5,'p_dispatch','parser.py',201),
+  ('dispatch -> SBR_OPEN IDENTIFIER repeate SBR_CLOSE','dispatch',4,'p_dispatch','parser.py',202),
+  ('dispatch -> SBR_OPEN BS IDENTIFIER SBR_CLOSE','dispatch',4,'p_dispatch','parser.py',203),
+  ('dispatch -> SBR_OPEN IDENTIFIER SBR_CLOSE','dispatch',3,'p_dispatch','parser.py',204),
+  ('receive -> PAR_OPEN RS IDENTIFIER repeate PAR_CLOSE','receive',5,'p_receive','parser.py',225),
+  ('receive -> PAR_OPEN IDENTIFIER repeate PAR_CLOSE','receive',4,'p_receive','parser.py',226),
+  ('receive -> PAR_OPEN RS IDENTIFIER PAR_CLOSE','receive',4,'p_receive','parser.py',227),
+  ('receive -> PAR_OPEN IDENTIFIER PAR_CLOSE','receive',3,'p_receive','parser.py',228),
+  ('condition -> DIM_OPEN IDENTIFIER repeate DIM_CLOSE','condition',4,'p_condition','parser.py',248),
+  ('condition -> DIM_OPEN IDENTIFIER DIM_CLOSE','condition',3,'p_condition','parser.py',249),
+  ('subprocess -> BR_OPEN IDENTIFIER repeate BR_CLOSE','subprocess',4,'p_subprocess','parser.py',261),
+  ('subprocess -> BR_OPEN IDENTIFIER BR_CLOSE','subprocess',3,'p_subprocess','parser.py',262),
+]
@@ -931,6 +931,10 @@ def _remove_statics(logger, sa, process):
                             _values_map[file] = sortedcontainers.SortedDict()
                         _values_map[file][new_value] = implementation.value
 
+                        # Implementations are shared between instance maps, so change a copy
+                        implementation = copy.copy(implementation)
+                        access_map[access][interface] = implementation
+
                         # This is quite precise match to avoid an exception assign valus through a void* match
                         if implementation.declaration != declaration and \
                                 isinstance(implementation.declaration, Pointer):
@@ -971,6 +975,17 @@ def _copy_process(process, instances_left):
     return inst
 
 
+def _copy_map(access_map):
+    """
+    Copy an instance map. Implementation objects are not copied and shared between instance maps, so they should be
+    copied before any changes.
+
+    :param access_map: {'Access.expression string'->'Interface string'->'Implementation object/None'}.
+    :return: A copy of the map.
+    """
+    return {expression: dict(interfaces) for expression, interfaces in access_map.items()}
+
+
 def _split_into_instances(sa, interfaces, process, resource_new_insts, simplified_map=None):
     """
     Get a process and calculate instances to get automata with exactly one implementation per interface.
@@ -1008,7 +1023,7 @@ def _split_into_instances(sa, interfaces, process, resource_new_insts, simplifie
         ivector = [0 for _ in enumerate(final_options_list)]
 
         for _ in enumerate(interface_to_value[final_options_list[0]]):
-            new_map = copy.deepcopy(access_map)
+            new_map = _copy_map(access_map)
             chosen_values = sortedcontainers.SortedSet()
 
             # Set chosen implementations
@@ -1043,7 +1058,7 @@ def _split_into_instances(sa, interfaces, process, resource_new_insts, simplifie
             # container
             if access_map[expression][interface] and [val for val in interface_to_value[interface]
                                                       if interface_to_value[interface][val]]:
-                new = [copy.deepcopy(maps[0][0]), copy.copy(maps[0][1])]
+                new = [_copy_map(maps[0][0]), copy.copy(maps[0][1])]
                 new[1].remove(new[0][expression][interface])
                 new[0][expression][interface] = None
                 maps.append(new)
@@ -1278,7 +1293,8 @@ def _match_array_maps(expression, interface, values, maps, interface_to_value, v
                                'Implementation object/None'}, set{used values strings}]}
     """
     result_map = sortedcontainers.SortedDict()
-    added = []
+    # Maps are compared by identity since different maps can refer the same implementations
+    added = set()
 
     for value in values:
         v_implementation = value_to_implementation[value]
@@ -1286,14 +1302,14 @@ def _match_array_maps(expression, interface, values, maps, interface_to_value, v
 
         if interface_to_value[interface][value]:
             suitable_map = None
-            for mp, chosen_values in ((m, cv) for m, cv in maps if not m[expression][interface] and m not in added):
+            for mp, chosen_values in ((m, cv) for m, cv in maps if not m[expression][interface] and id(m) not in added):
                 for e in (e for e in mp.keys() if isinstance(mp[e], dict)):
                     same_container = \
                         [mp for i in mp[e] if i != interface and isinstance(mp[e][i], Implementation) and
                          mp[e][i].base_value and _from_same_container(v_implementation, mp[e][i])]
-                    if same_container and mp not in added:
+                    if same_container and id(mp) not in added:
                         suitable_map = [mp, chosen_values]
-                        added.append(mp)
+                        added.add(id(mp))
                         break
                 if suitable_map:
                     break
@@ -1338,7 +1354,7 @@ def _fulfil_map(expression, interface, value_map, reuse, value_to_implementation
             if reuse:
                 new = reuse.pop()
             else:
-                new = [copy.deepcopy(first[0]), copy.copy(first[1])]
+                new = [_copy_map(first[0]), copy.copy(first[1])]
                 new_maps.append(new)
 
         new[0][expression][interface] = value_to_implementation[value]
@@ -15,8 +15,10 @@
 # limitations under the License.
 #
 
+import hashlib
 import os
 import re
+import shutil
 import zipfile
 import json
 import klever.core.utils
@@ -33,6 +35,11 @@ def merge_files(logger, conf, abstract_task_desc):
     """
     logger.info('Merge source files by means of CIL')
 
+    c_files = [
+        os.path.join(conf['main working directory'], extra_c_file['C file'])
+        for extra_c_file in abstract_task_desc['extra C files']
+        if 'C file' in extra_c_file
+    ]
     args = ['toplevel.opt'] + \
         conf.get('CIL additional opts', []) + \
         [
@@ -66,20 +73,63 @@ def merge_files(logger, conf, abstract_task_desc):
             '-print', '-print-lines', '-no-print-annot',
             '-ocode', 'cil.i',
         ] + \
-        [
-            os.path.join(conf['main working directory'], extra_c_file['C file'])
-            for extra_c_file in abstract_task_desc['extra C files']
-            if 'C file' in extra_c_file
-           ]
+        c_files
+
+    # The same source files are merged again when verification tasks are rescheduled with other resource limits, so
+    # get merged source files from cache if possible. Rescheduled tasks are generated within the working directory of
+    # the original task, so the cache is kept there and it is removed together with that directory. Paths of source
+    # files are taken into account as well since they can be referred within the merged file.
+    task_dir = _get_task_dir(abstract_task_desc['id'])
+    if not task_dir:
+        klever.core.utils.execute(logger, args=args, enforce_limitations=True)
+        _remove_empty_problem_desc()
+    else:
+        key = hashlib.sha256(json.dumps(
+            [args] + [klever.core.utils.get_file_checksum(c_file) for c_file in c_files]).encode('utf8')).hexdigest()
+        cache_dir = os.path.join(task_dir, 'merged files cache', key)
+        os.makedirs(os.path.dirname(cache_dir), exist_ok=True)
+        with klever.core.utils.LockedOpen(cache_dir + '.tmp', 'w'):
+            if os.path.exists(cache_dir):
+                logger.info('Get merged source files from cache')
+                _link_or_copy(os.path.join(cache_dir, 'cil.i'), 'cil.i')
+            else:
+                klever.core.utils.execute(logger, args=args, enforce_limitations=True)
+                _remove_empty_problem_desc()
+
+                logger.info('Store merged source files to cache')
+                os.makedirs(cache_dir)
+                _link_or_copy('cil.i', os.path.join(cache_dir, 'cil.i'))
+
+    logger.debug('Merged source files was outputted to "cil.i"')
+
+    return 'cil.i'
 
-    klever.core.utils.execute(logger, args=args, enforce_limitations=True)
+
+def _get_task_dir(task_id):
+    # Plugins are run within subdirectories of the task working directory which ends with the task identifier (program
+    # fragment and requirements specification identifiers). Rescheduled tasks have one more level of subdirectories.
+    task_dir = os.getcwd()
+    while not task_dir.endswith(os.path.sep + task_id):
+        parent_dir = os.path.dirname(task_dir)
+        if parent_dir == task_dir:
+            return None
+        task_dir = parent_dir
+    return task_dir
+
+
+def _remove_empty_problem_desc():
     # There will be empty file if CIL succeeded. Remove it to avoid unknown reports of whole FVTP later.
     if os.path.isfile('problem desc.txt'):
         os.unlink('problem desc.txt')
 
-    logger.debug('Merged source files was outputted to "cil.i"')
 
-    return 'cil.i'
+def _link_or_copy(src, dst):
+    # Merged source files are rather large while they are never changed after all, so do not waste disk space for
+    # their copies in cache when possible.
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
 
 
 def get_verifier_opts_and_safe_prps(logger, resource_limits, conf):
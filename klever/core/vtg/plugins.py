@@ -24,23 +24,28 @@ import klever.core.utils
 
 class Plugin(klever.core.components.Component):
     depend_on_requirement = True
+    # Plugins run within the same process can get and pass abstract verification task descriptions without files.
+    abstract_task_desc = None
+    dump_abstract_task_desc = True
 
     def run(self):
-        in_abstract_task_desc_file = os.path.relpath(
-            os.path.join(self.conf['main working directory'], self.conf['in abstract task desc file']))
-        self.logger.info(
-            'Get abstract verification task description from file "{0}"'.format(in_abstract_task_desc_file))
-        with open(in_abstract_task_desc_file, encoding='utf8') as fp:
-            self.abstract_task_desc = json.load(fp)
+        if self.abstract_task_desc is None:
+            in_abstract_task_desc_file = os.path.relpath(
+                os.path.join(self.conf['main working directory'], self.conf['in abstract task desc file']))
+            self.logger.info(
+                'Get abstract verification task description from file "{0}"'.format(in_abstract_task_desc_file))
+            with open(in_abstract_task_desc_file, encoding='utf8') as fp:
+                self.abstract_task_desc = json.load(fp)
 
         self.logger.info('Start processing of abstract verification task "{0}"'.format(self.abstract_task_desc['id']))
         klever.core.components.Component.run(self)
 
-        out_abstract_task_desc_file = os.path.relpath(
-            os.path.join(self.conf['main working directory'], self.conf['out abstract task desc file']))
-        self.logger.info(
-            'Put modified abstract verification task description to file "{0}"'.format(out_abstract_task_desc_file))
-        with open(out_abstract_task_desc_file, 'w', encoding='utf8') as fp:
-            klever.core.utils.json_dump(self.abstract_task_desc, fp, self.conf['keep intermediate files'])
+        if self.dump_abstract_task_desc:
+            out_abstract_task_desc_file = os.path.relpath(
+                os.path.join(self.conf['main working directory'], self.conf['out abstract task desc file']))
+            self.logger.info(
+                'Put modified abstract verification task description to file "{0}"'.format(out_abstract_task_desc_file))
+            with open(out_abstract_task_desc_file, 'w', encoding='utf8') as fp:
+                klever.core.utils.json_dump(self.abstract_task_desc, fp, self.conf['keep intermediate files'])
 
         self.logger.info('Finish processing of abstract verification task "{0}"'.format(self.abstract_task_desc['id']))
@@ -16,9 +16,9 @@
 #
 
 import os
-from clade import Clade
 
 import klever.core.utils
+import klever.core.clade_service
 import klever.core.vtg.plugins
 import klever.core.vtg.utils
 
@@ -175,7 +175,7 @@ class RSG(klever.core.vtg.plugins.Plugin):
 
         # Generate CC full description file per each model and add it to abstract task description.
         # First of all obtain CC options to be used to compile models.
-        clade = Clade(self.conf['build base'])
+        clade = klever.core.clade_service.get_clade(self.logger, self.conf)
         if not clade.work_dir_ok():
             raise RuntimeError('Build base is not OK')
         meta = clade.get_meta()
@@ -22,6 +22,45 @@ import jinja2
 import klever.core.vtg.plugins
 
 
+# Environments are created once per process since they compile templates and cache them.
+_environments = dict()
+
+
+def get_environment(templates_dir, bytecode_cache_dir):
+    """
+    Get Jinja2 environment for rendering templates. Compiled templates are stored to the bytecode cache shared by all
+    processes, so they are compiled just once per job.
+
+    :param templates_dir: Directory with templates.
+    :param bytecode_cache_dir: Directory for the bytecode cache.
+    :return: jinja2.Environment object.
+    """
+    key = (templates_dir, bytecode_cache_dir)
+    if key not in _environments:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        _environments[key] = jinja2.Environment(
+            # All templates reside in the same directory as specifications base.
+            loader=jinja2.FileSystemLoader(templates_dir),
+            bytecode_cache=jinja2.FileSystemBytecodeCache(bytecode_cache_dir),
+            # This allows to start template statements with the specified prefix rather than to put them inside
+            # special "braces", e.g. in "{% ... %}" by default.
+            # "//" is the beginning of one-line C/C++ comments, so editors will likely treat these lines as
+            # comments if one will use C syntax highlighting.
+            line_statement_prefix='//',
+            # Remove excessive whitespaces. Users needn't know that they see on rendered templates.
+            trim_blocks=True,
+            lstrip_blocks=True,
+            # Keep new line at the EOF. This is required, for instance, for aspect templates since they are
+            # concatenated with other aspects after rendering.
+            keep_trailing_newline=True,
+            # Raise exception if some template value is undefined. This can happens if template or/and template
+            # context is incorrect.
+            undefined=jinja2.StrictUndefined
+        )
+
+    return _environments[key]
+
+
 class TR(klever.core.vtg.plugins.Plugin):
 
     def __init__(self, conf, logger, parent_id, callbacks, mqs, vals, id=None, work_dir=None, attrs=None,
@@ -40,24 +79,8 @@ class TR(klever.core.vtg.plugins.Plugin):
             # Here files containing rendered templates will be stored.
             self.abstract_task_desc['files'] = []
 
-            env = jinja2.Environment(
-                # All templates reside in the same directory as specifications base.
-                loader=jinja2.FileSystemLoader(os.path.dirname(self.conf['specifications base'])),
-                # This allows to start template statements with the specified prefix rather than to put them inside
-                # special "braces", e.g. in "{% ... %}" by default.
-                # "//" is the beginning of one-line C/C++ comments, so editors will likely treat these lines as
-                # comments if one will use C syntax highlighting.
-                line_statement_prefix='//',
-                # Remove excessive whitespaces. Users needn't know that they see on rendered templates.
-                trim_blocks=True,
-                lstrip_blocks=True,
-                # Keep new line at the EOF. This is required, for instance, for aspect templates since they are
-                # concatenated with other aspects after rendering.
-                keep_trailing_newline=True,
-                # Raise exception if some template value is undefined. This can happens if template or/and template
-                # context is incorrect.
-                undefined=jinja2.StrictUndefined
-            )
+            env = get_environment(os.path.dirname(self.conf['specifications base']),
+                                  os.path.join(self.conf['cache directory'], 'templates'))
 
             for tmpl in self.conf['templates']:
                 self.logger.info('Render template "{0}"'.format(tmpl))
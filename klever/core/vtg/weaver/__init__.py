@@ -15,8 +15,10 @@
 # limitations under the License.
 #
 
+import concurrent.futures
 import glob
 import fileinput
+import hashlib
 import json
 import os
 import shutil
@@ -24,6 +26,7 @@ import shutil
 from clade import Clade
 
 import klever.core.utils
+import klever.core.clade_service
 import klever.core.vtg.utils
 import klever.core.vtg.plugins
 from klever.core.cross_refs import CrossRefs
@@ -40,7 +43,7 @@ class Weaver(klever.core.vtg.plugins.Plugin):
     def weave(self):
         self.abstract_task_desc.setdefault('extra C files', dict())
 
-        clade = Clade(self.conf['build base'])
+        clade = klever.core.clade_service.get_clade(self.logger, self.conf)
         if not clade.work_dir_ok():
             raise RuntimeError('Build base is not OK')
         meta = clade.get_meta()
@@ -54,8 +57,11 @@ class Weaver(klever.core.vtg.plugins.Plugin):
         # Print stubs instead of inline Assembler since verifiers do not interpret it and even can fail.
         env['LDV_INLINE_ASM_STUB'] = ''
 
+        # Prepare all C files to be woven in at first and then process them in parallel since Weaver can spend too much
+        # time for program fragments consisting of many C files.
+        weavings = []
         for grp in self.abstract_task_desc['grps']:
-            self.logger.info('Weave in C files of group "{0}"'.format(grp['id']))
+            self.logger.info('Prepare C files of group "{0}" for weaving'.format(grp['id']))
 
             for extra_cc in grp['Extra CCs']:
                 # Each CC is either pair (compiler command identifier, compiler command type) or JSON file name
@@ -81,19 +87,20 @@ class Weaver(klever.core.vtg.plugins.Plugin):
                     infile = extra_cc["in file"]
                 else:
                     infile = cc["in"][0]
-                # Distinguish source files having the same names.
-                outfile_unique = '{0}.c'.format(klever.core.utils.unique_file_name(os.path.splitext(os.path.basename(
-                    infile))[0], '.c'))
+                # Distinguish source files having the same names. Use absolute paths since C files are woven in in
+                # parallel while some steps change the current working directory.
+                outfile_unique = os.path.realpath('{0}.c'.format(klever.core.utils.unique_file_name(
+                    os.path.splitext(os.path.basename(infile))[0], '.c')))
                 # This is used for storing/getting to/from cache where uniqueness is guaranteed by other means.
                 outfile = '{0}.c'.format(os.path.splitext(os.path.basename(infile))[0])
-                self.logger.info('Weave in C file "{0}"'.format(infile))
 
                 # Produce aspect to be weaved in.
                 if 'plugin aspects' in extra_cc:
-                    self.logger.info('Concatenate all aspects of all plugins together')
+                    self.logger.info('Concatenate all aspects of all plugins together for C file "{0}"'
+                                     .format(infile))
 
-                    # Resulting aspect.
-                    aspect = 'aspect'
+                    # Resulting aspect. It is unique for each C file since they are woven in in parallel.
+                    aspect = outfile_unique + ' aspect'
 
                     # Get all aspects. Place RSG aspects at beginning since they can instrument entities added by
                     # aspects of other plugins while corresponding function declarations still need be at beginning
@@ -117,11 +124,6 @@ class Weaver(klever.core.vtg.plugins.Plugin):
                     # at merging source files and models together.
                     aspect = None
 
-                if aspect:
-                    self.logger.info('Aspect to be weaved in is "{0}"'.format(aspect))
-                else:
-                    self.logger.info('C file will be passed through C Back-end only')
-
                 storage_path = clade.get_storage_path(infile)
                 if meta['conf'].get('Compiler.preprocess_cmds', False) and \
                         'klever-core-work-dir' not in storage_path:
@@ -131,45 +133,32 @@ class Weaver(klever.core.vtg.plugins.Plugin):
 
                 is_model = (grp['id'] == 'models')
 
-                # Original sources should be woven in and we do not need to get cross references for them since this
-                # was already done before.
-                if not is_model:
-                    self.__weave(storage_path, cc['opts'], aspect, outfile_unique, clade, env, cwd,
-                                 aspectator_search_dir, is_model)
-                # For generated models we need to weave them in (actually, just pass through C Back-end) and to get
-                # cross references always since most likely they all are different.
-                elif 'generated' in extra_cc:
-                    self.__weave(storage_path, cc['opts'], aspect, outfile_unique, clade, env, cwd,
-                                 aspectator_search_dir, is_model)
-                    if self.conf['code coverage details'] != 'Original C source files':
-                        self.__get_cross_refs(storage_path, cc['opts'], outfile_unique, clade, cwd,
-                                              aspectator_search_dir)
-                # For non-generated models use results cache in addition.
-                else:
-                    cache_dir = os.path.join(self.conf['cache directory'],
-                                             klever.core.utils.get_file_checksum(storage_path))
-                    with klever.core.utils.LockedOpen(cache_dir + '.tmp', 'w'):
-                        if os.path.exists(cache_dir):
-                            self.logger.info('Get woven in C file from cache')
-                            self.abstract_task_desc['extra C files'].append(
-                                {'C file': os.path.relpath(os.path.join(cache_dir, os.path.basename(outfile)),
-                                                           self.conf['main working directory'])})
-                            if self.conf['code coverage details'] != 'Original C source files':
-                                self.logger.info('Get cross references from cache')
-                                self.__merge_additional_srcs(os.path.join(cache_dir, 'additional sources'))
-                        else:
-                            os.makedirs(cache_dir)
-                            self.__weave(storage_path, cc['opts'], aspect, outfile_unique, clade, env, cwd,
-                                         aspectator_search_dir, is_model)
-                            self.logger.info('Store woven in C file to cache')
-                            shutil.copy(outfile_unique, os.path.join(cache_dir, outfile))
-
-                            if self.conf['code coverage details'] != 'Original C source files':
-                                self.__get_cross_refs(storage_path, cc['opts'], outfile_unique, clade, cwd,
-                                                      aspectator_search_dir)
-                                self.logger.info('Store cross references to cache')
-                                shutil.copytree(outfile_unique + ' additional sources',
-                                                os.path.join(cache_dir, 'additional sources'))
+                weavings.append((infile, storage_path, cc['opts'], aspect, outfile, outfile_unique, cwd, is_model,
+                                 'generated' in extra_cc))
+
+        # Only original sources are woven in in parallel. Getting cross references for models involves Clade that
+        # changes the current working directory and environment variables, so models are processed serially after that.
+        src_weavings = [i for i, weaving in enumerate(weavings) if not weaving[7]]
+        workers_num = min(len(src_weavings), self.__get_workers_num()) or 1
+        self.logger.info('Weave in {0} C files using {1} workers'.format(len(src_weavings), workers_num))
+        results = [None] * len(weavings)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers_num) as executor:
+            futures = {i: executor.submit(self.__weave_c_file, *weavings[i], clade, env, aspectator_search_dir)
+                       for i in src_weavings}
+            for i, future in futures.items():
+                results[i] = future.result()
+
+        for i, weaving in enumerate(weavings):
+            if i not in futures:
+                results[i] = self.__weave_c_file(*weaving, clade, env, aspectator_search_dir)
+
+        # Merge results in the order of C files rather than in the order of their completion to get the same abstract
+        # task descriptions and additional sources regardless of parallelism. Merging of additional sources changes
+        # the current working directory, so it is done when all workers finish.
+        for c_file, additional_srcs in results:
+            self.abstract_task_desc['extra C files'].append({'C file': c_file})
+            if additional_srcs:
+                self.__merge_additional_srcs(additional_srcs)
 
         # For auxiliary files there is no cross references since it is rather hard to get them from Aspectator. But
         # there still highlighting.
@@ -219,36 +208,155 @@ class Weaver(klever.core.vtg.plugins.Plugin):
         del (self.abstract_task_desc['grps'])
         del (self.abstract_task_desc['deps'])
 
-    def __weave(self, storage_path, opts, aspect, outfile, clade, env, cwd, aspectator_search_dir, is_model):
-        klever.core.utils.execute(
-            self.logger,
-            tuple(
-                [
-                    'cif',
-                    '--in', storage_path,
-                    # Besides header files specific for requirements specifications will be searched for.
-                    '--general-opts',
-                    '-I' + os.path.join(os.path.dirname(self.conf['specifications base']), 'include'),
-                    '--aspect-preprocessing-opts', ' '.join(self.conf['aspect preprocessing options'])
-                    if 'aspect preprocessing options' in self.conf else '',
-                    '--out', os.path.realpath(outfile),
-                    '--back-end', 'src',
-                    '--debug', 'DEBUG'
-                ] +
-                (['--keep'] if self.conf['keep intermediate files'] else []) +
-                (['--aspect', os.path.realpath(aspect)] if aspect else ['--stage', 'C-backend']) +
-                ['--', '-include', 'ldv/common.h'] +
-                klever.core.vtg.utils.prepare_cif_opts(opts, clade, is_model) +
-                [aspectator_search_dir] +
-                ['-I' + clade.get_storage_path(p) for p in self.conf['working source trees']]
-            ),
-            env=env,
-            cwd=cwd,
-            timeout=0.01,
-            filter_func=klever.core.vtg.utils.CIFErrorFilter())
-
-        self.abstract_task_desc['extra C files'].append(
-            {'C file': os.path.relpath(outfile, self.conf['main working directory'])})
+    def __get_workers_num(self):
+        if self.conf.get('weaving workers'):
+            return self.conf['weaving workers']
+
+        # Several tasks are generated in parallel, so each of them can use just its share of CPU cores.
+        try:
+            return max(klever.core.utils.get_parallel_threads_num(self.logger, self.conf) //
+                       klever.core.utils.get_parallel_threads_num(self.logger, self.conf, 'Tasks generation'), 1)
+        except KeyError:
+            return 1
+
+    def __weave_c_file(self, infile, storage_path, opts, aspect, outfile, outfile_unique, cwd, is_model, generated,
+                       clade, env, aspectator_search_dir):
+        """
+        Weave in the C file. This method is executed by several threads in parallel for original sources, so it should
+        not change the abstract task description and the current working directory.
+
+        :return: Path to the woven in C file relative to the main working directory and a directory with additional
+                 sources to be merged or None.
+        """
+        self.logger.info('Weave in C file "{0}"'.format(infile))
+        if aspect:
+            self.logger.info('Aspect to be weaved in is "{0}"'.format(aspect))
+        else:
+            self.logger.info('C file will be passed through C Back-end only')
+
+        # Original sources should be woven in and we do not need to get cross references for them since this
+        # was already done before.
+        if not is_model:
+            return self.__weave(storage_path, opts, aspect, outfile_unique, clade, env, cwd, aspectator_search_dir,
+                                is_model, use_cache=True), None
+        # For generated models we need to weave them in (actually, just pass through C Back-end) and to get
+        # cross references always since most likely they all are different.
+        elif generated:
+            c_file = self.__weave(storage_path, opts, aspect, outfile_unique, clade, env, cwd, aspectator_search_dir,
+                                  is_model)
+            if self.conf['code coverage details'] != 'Original C source files':
+                self.__get_cross_refs(storage_path, opts, outfile_unique, clade, cwd, aspectator_search_dir)
+                return c_file, outfile_unique + ' additional sources'
+            return c_file, None
+
+        # For non-generated models use results cache in addition.
+        cache_dir = os.path.join(self.conf['cache directory'], klever.core.utils.get_file_checksum(storage_path))
+        with klever.core.utils.LockedOpen(cache_dir + '.tmp', 'w'):
+            if os.path.exists(cache_dir):
+                self.logger.info('Get woven in C file from cache')
+                c_file = os.path.relpath(os.path.join(cache_dir, os.path.basename(outfile)),
+                                         self.conf['main working directory'])
+                if self.conf['code coverage details'] != 'Original C source files':
+                    self.logger.info('Get cross references from cache')
+                    return c_file, os.path.join(cache_dir, 'additional sources')
+                return c_file, None
+
+            os.makedirs(cache_dir)
+            c_file = self.__weave(storage_path, opts, aspect, outfile_unique, clade, env, cwd, aspectator_search_dir,
+                                  is_model)
+            self.logger.info('Store woven in C file to cache')
+            shutil.copy(outfile_unique, os.path.join(cache_dir, outfile))
+
+            if self.conf['code coverage details'] != 'Original C source files':
+                self.__get_cross_refs(storage_path, opts, outfile_unique, clade, cwd, aspectator_search_dir)
+                self.logger.info('Store cross references to cache')
+                shutil.copytree(outfile_unique + ' additional sources', os.path.join(cache_dir, 'additional sources'))
+                return c_file, outfile_unique + ' additional sources'
+            return c_file, None
+
+    def __weave(self, storage_path, opts, aspect, outfile, clade, env, cwd, aspectator_search_dir, is_model,
+                use_cache=False):
+        # Besides header files specific for requirements specifications will be searched for.
+        general_opts = [
+            '--general-opts',
+            '-I' + os.path.join(os.path.dirname(self.conf['specifications base']), 'include'),
+            '--aspect-preprocessing-opts', ' '.join(self.conf['aspect preprocessing options'])
+            if 'aspect preprocessing options' in self.conf else ''
+        ]
+        compiler_opts = ['-include', 'ldv/common.h'] + \
+            klever.core.vtg.utils.prepare_cif_opts(opts, clade, is_model) + \
+            [aspectator_search_dir] + \
+            ['-I' + clade.get_storage_path(p) for p in self.conf['working source trees']]
+
+        def weave():
+            klever.core.utils.execute(
+                self.logger,
+                tuple(
+                    [
+                        'cif',
+                        '--in', storage_path
+                    ] +
+                    general_opts +
+                    [
+                        '--out', os.path.realpath(outfile),
+                        '--back-end', 'src',
+                        '--debug', 'DEBUG'
+                    ] +
+                    (['--keep'] if self.conf['keep intermediate files'] else []) +
+                    (['--aspect', os.path.realpath(aspect)] if aspect else ['--stage', 'C-backend']) +
+                    ['--'] +
+                    compiler_opts
+                ),
+                env=env,
+                cwd=cwd,
+                timeout=0.01,
+                filter_func=klever.core.vtg.utils.CIFErrorFilter())
+
+        if not use_cache:
+            weave()
+            return os.path.relpath(outfile, self.conf['main working directory'])
+
+        # Woven in C files refer both the source file and the aspect, so the latter should not depend on the task
+        # which woven in C file will be reused by other ones. Store the aspect to cache by its checksum for that.
+        aspect_checksum = None
+        if aspect:
+            aspect_checksum = klever.core.utils.get_file_checksum(aspect)
+            cached_aspect = os.path.join(self.conf['cache directory'], 'aspects', aspect_checksum + '.aspect')
+            os.makedirs(os.path.dirname(cached_aspect), exist_ok=True)
+            with klever.core.utils.LockedOpen(cached_aspect + '.tmp', 'w'):
+                if not os.path.isfile(cached_aspect):
+                    shutil.copy(aspect, cached_aspect)
+            aspect = cached_aspect
+
+        # Different requirements specifications and program fragments often need the same C file to be woven in with
+        # the same aspect. Woven in C files are stored to cache by the hash of everything that affects them.
+        key = hashlib.sha256(json.dumps([
+            storage_path,
+            klever.core.utils.get_file_checksum(storage_path),
+            aspect_checksum,
+            is_model,
+            cwd,
+            general_opts,
+            compiler_opts
+        ]).encode('utf8')).hexdigest()
+        cache_dir = os.path.join(self.conf['cache directory'], key)
+        cache_file = os.path.join(cache_dir, os.path.basename(outfile))
+        with klever.core.utils.LockedOpen(cache_dir + '.tmp', 'w'):
+            if os.path.exists(cache_dir):
+                self.logger.info('Get woven in C file from cache')
+                cache_file = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+            else:
+                weave()
+                self.logger.info('Store woven in C file to cache')
+                # Cache directory should never be observed partially filled, e.g. if Weaver will fail in the middle.
+                tmp_cache_dir = cache_dir + ' tmp'
+                if os.path.exists(tmp_cache_dir):
+                    shutil.rmtree(tmp_cache_dir)
+                os.makedirs(tmp_cache_dir)
+                shutil.copy(outfile, os.path.join(tmp_cache_dir, os.path.basename(outfile)))
+                os.replace(tmp_cache_dir, cache_dir)
+
+        return os.path.relpath(cache_file, self.conf['main working directory'])
 
     def __get_cross_refs(self, storage_path, opts, outfile, clade, cwd, aspectator_search_dir):
         # Get cross references and everything required for them.
@@ -308,8 +416,6 @@ class Weaver(klever.core.vtg.plugins.Plugin):
                                        new_file, self.search_dirs)
                 cross_refs.get_cross_refs()
 
-        self.__merge_additional_srcs(outfile + ' additional sources')
-
         if not self.conf['keep intermediate files']:
             shutil.rmtree(outfile + ' clade')
 